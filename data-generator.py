@@ -1,32 +1,64 @@
-import json
+import orjson
 import os
 from InquirerPy import inquirer
 import uuid
 import random
+import calendar
+from multiprocessing import Pool
 from datetime import datetime, timedelta
 from faker import Faker
 
 fake = Faker('en_gb')
 
+# Dataset files are written record by record, so use a large buffer to keep write() calls down
+WRITE_BUFFER_SIZE = 1 << 20
+# Datasets at least this large are generated across a pool of worker processes
+PARALLEL_THRESHOLD = 50_000
+
+
+# Ids of datasets referenced by foreign_key fields, loaded once per dataset name
+_fk_cache: dict[str, list] = {}
+
+
+def clear_foreign_key_cache():
+    _fk_cache.clear()
+
 
 def generate_foreign_key(options: dict) -> str:
     dataset_name = options.get("dataset")
     if not dataset_name:
         raise ValueError("foreign_key generator requires a 'dataset' option")
 
-    # Load dataset once and cache it for performance if needed
-    # For simplicity, load fresh each time here:
-    try:
-        with open(f"{dataset_name}.json") as f:
-            dataset = json.load(f)
-    except FileNotFoundError:
-        raise FileNotFoundError(f"Dataset file '{dataset_name}.json' not found")
-
     # Pick a random record's id
-    if not dataset:
-        raise ValueError(f"Dataset '{dataset_name}' is empty")
+    return random.choice(load_foreign_key_ids(dataset_name))
+
+
+def load_foreign_key_ids(dataset_name: str) -> list:
+    ids = _fk_cache.get(dataset_name)
+    if ids is None:
+        try:
+            with open(f"{dataset_name}.json", "rb") as f:
+                dataset = orjson.loads(f.read())
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Dataset file '{dataset_name}.json' not found")
 
-    return random.choice(dataset)["id"]
+        if not dataset:
+            raise ValueError(f"Dataset '{dataset_name}' is empty")
+
+        ids = [record["id"] for record in dataset]
+        _fk_cache[dataset_name] = ids
+    return ids
+
+
+def prime_foreign_keys(schema: dict):
+    # Load the ids of every dataset the schema references before any record is generated, so a missing
+    # or empty dataset fails up front, and a dataset referencing itself reads its ids before it is rewritten
+    for field, spec in schema.get("fields", {}).items():
+        if spec.get("type") == "foreign_key":
+            dataset_name = spec.get("options", {}).get("dataset")
+            if not dataset_name:
+                raise ValueError(f"foreign_key field '{field}' requires a 'dataset' option")
+            load_foreign_key_ids(dataset_name)
 
 def generate_avatar(options: dict) -> str:
     seed = generate_uuid(None)
@@ -81,6 +113,17 @@ def generate_integer(options: dict) -> int:
     return random.randint(min, max)
 
 
+def generate_integer_bulk(options: dict, count: int) -> list[int]:
+    min = options.get("min", 0)
+    max = options.get("max", 100)
+    if max < min:
+        # Match the per-record path, where randint rejects a reversed range
+        raise ValueError(f"Integer range ends before it starts: min {min}, max {max}")
+    span = max - min + 1
+    rand = random.random
+    return [min + int(rand() * span) for _ in range(count)]
+
+
 def generate_price(options: dict) -> float:
     min = options.get("min", 1)
     max = options.get("max", 1000)
@@ -88,10 +131,34 @@ def generate_price(options: dict) -> float:
     return round(price, 2)
 
 
+def generate_price_bulk(options: dict, count: int) -> list[float]:
+    min = options.get("min", 1)
+    max = options.get("max", 1000)
+    span = max - min
+    rand = random.random
+    return [round(min + rand() * span, 2) for _ in range(count)]
+
+
 def generate_uuid(options: dict) -> str:
     return str(uuid.uuid4())
 
 
+def generate_uuids_bulk(n: int) -> list[str]:
+    # One urandom call for all ids, with the version 4 and RFC 4122 variant bits set as uuid4() does
+    buf = bytearray(os.urandom(16 * n))
+    buf[6::16] = bytes((b & 0x0F) | 0x40 for b in buf[6::16])
+    buf[8::16] = bytes((b & 0x3F) | 0x80 for b in buf[8::16])
+    h = buf.hex()
+    return [
+        f"{h[i:i + 8]}-{h[i + 8:i + 12]}-{h[i + 12:i + 16]}-{h[i + 16:i + 20]}-{h[i + 20:i + 32]}"
+        for i in range(0, 32 * n, 32)
+    ]
+
+
+def generate_uuid_bulk(options: dict, count: int) -> list[str]:
+    return generate_uuids_bulk(count)
+
+
 def generate_name(options: dict) -> str:
     return fake.name()
 
@@ -115,31 +182,81 @@ def generate_phone(options: dict) -> str:
     return prefix + remaining_digits
 
 
-def generate_datetime_utc(options: dict) -> str:
+# Maps random bytes to ASCII digits; bytes 250-255 are dropped so every digit is equally likely
+_DIGIT_TABLE = bytes(0x30 + b % 10 for b in range(256))
+_BIASED_BYTES = bytes(range(250, 256))
+
+
+def generate_phone_bulk(options: dict, count: int) -> list[str]:
+    char_length = options.get("char_length", 11)
+    prefix = options.get("prefix", "0")
+    remaining_len = char_length - len(prefix)
+    if remaining_len <= 0:
+        return [prefix[:char_length]] * count
+    needed = count * remaining_len
+    digits = b""
+    while len(digits) < needed:
+        digits += os.urandom(needed - len(digits) + 16).translate(_DIGIT_TABLE, _BIASED_BYTES)
+    digits = digits[:needed].decode("ascii")
+    return [prefix + digits[i:i + remaining_len] for i in range(0, needed, remaining_len)]
+
+
+# (start epoch seconds, seconds in range) keyed on the date options, computed once per range
+# Dates are built from _EPOCH with timedelta, which unlike time.gmtime also covers years before 1970 on Windows
+_EPOCH = datetime(1970, 1, 1)
+_date_prep_cache: dict[tuple, tuple[int, int]] = {}
+
+
+def prepare_date_range(options: dict) -> tuple[int, int]:
     # Extract start and end components with defaults
-    start_year = options.get("start_year", 2000)
-    start_month = options.get("start_month", 1)
-    start_day = options.get("start_day", 1)
+    key = (
+        options.get("start_year", 2000),
+        options.get("start_month", 1),
+        options.get("start_day", 1),
+        options.get("end_year", 2025),
+        options.get("end_month", 12),
+        options.get("end_day", 31),
+    )
+    prepared = _date_prep_cache.get(key)
+    if prepared is None:
+        start_date = datetime(*key[:3])
+        end_date = datetime(*key[3:])
+        if end_date < start_date:
+            raise ValueError(f"Date range ends before it starts: {start_date.date()} to {end_date.date()}")
+        # Compute total seconds range, inclusive of the end date itself
+        delta_seconds = int((end_date - start_date).total_seconds())
+        prepared = (calendar.timegm(start_date.timetuple()), delta_seconds + 1)
+        _date_prep_cache[key] = prepared
+    return prepared
 
-    end_year = options.get("end_year", 2025)
-    end_month = options.get("end_month", 12)
-    end_day = options.get("end_day", 31)
 
-    start_date = datetime(start_year, start_month, start_day)
-    end_date = datetime(end_year, end_month, end_day)
+def generate_datetime_utc(options: dict) -> str:
+    start_ts, span = prepare_date_range(options)
 
     # 50% chance of returning a blank string if nullable
     if options.get("nullable", False) and random.random() < 0.5:
         return ""
 
-    # Compute total seconds range
-    delta_seconds = int((end_date - start_date).total_seconds())
-    random_seconds = random.randint(0, delta_seconds)
-
-    random_datetime = start_date + timedelta(seconds=random_seconds)
+    random_datetime = _EPOCH + timedelta(seconds=start_ts + int(random.random() * span))
     return random_datetime.strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
+def generate_datetime_utc_bulk(options: dict, count: int) -> list[str]:
+    start_ts, span = prepare_date_range(options)
+    nullable = options.get("nullable", False)
+    rand = random.random
+
+    values = []
+    for _ in range(count):
+        # 50% chance of returning a blank string if nullable
+        if nullable and rand() < 0.5:
+            values.append("")
+        else:
+            random_datetime = _EPOCH + timedelta(seconds=start_ts + int(rand() * span))
+            values.append(random_datetime.strftime("%Y-%m-%dT%H:%M:%SZ"))
+    return values
+
+
 def load_schema(data_set_name, prompt_usage=False):
     schema_file = f"{data_set_name}-config.json"
     if os.path.exists(schema_file):
@@ -150,8 +267,8 @@ def load_schema(data_set_name, prompt_usage=False):
         else:
             use_existing = True
         if use_existing:
-            with open(schema_file) as f:
-                return json.load(f)
+            with open(schema_file, "rb") as f:
+                return orjson.loads(f.read())
     return None
 
 
@@ -160,13 +277,35 @@ def save_schema(data_set_name, fields, linked_to=None):
     if linked_to:
         full_schema["linked_to"] = linked_to
     full_schema["fields"] = fields
-    with open(f"{data_set_name}-config.json", "w") as f:
-        json.dump(full_schema, f, indent=2)
+    with open(f"{data_set_name}-config.json", "wb") as f:
+        f.write(orjson.dumps(full_schema, option=orjson.OPT_INDENT_2))
 
 
 def save_generated_data(data_set_name, data):
-    with open(f"{data_set_name}.json", "w") as f:
-        json.dump(data, f, indent=2)
+    # Stream records out one at a time so the whole dataset never has to be
+    # serialised in one buffer; the output matches an indent=2 dump of the list.
+    # Records go to a temporary file that only replaces the dataset once every record is written,
+    # so a failed or interrupted generation leaves the existing file as it was
+    target = f"{data_set_name}.json"
+    temp = f"{target}.tmp"
+    try:
+        with open(temp, "wb", buffering=WRITE_BUFFER_SIZE) as f:
+            first = True
+            saved = 0
+            for entry in data:
+                f.write(b"[\n  " if first else b",\n  ")
+                f.write(orjson.dumps(entry, option=orjson.OPT_INDENT_2).replace(b"\n", b"\n  "))
+                first = False
+                saved += 1
+            f.write(b"[]" if first else b"\n]")
+        os.replace(temp, target)
+    except BaseException:
+        if os.path.exists(temp):
+            os.remove(temp)
+        raise
+    # Any cached ids for this dataset are now stale
+    _fk_cache.pop(data_set_name, None)
+    return saved
 
 
 def ensure_id_field(fields: dict) -> dict:
@@ -175,8 +314,77 @@ def ensure_id_field(fields: dict) -> dict:
     return fields
 
 
+def compile_schema(schema: dict) -> list[tuple]:
+    # Resolve each field's generators once so record generation never looks them up again
+    compiled = []
+    for field, spec in schema.get("fields", {}).items():
+        field_type = spec.get("type")
+        gen_field = GEN_FIELDS.get(field_type)
+        if gen_field is None:
+            raise ValueError(f"Unknown field type '{field_type}' for field '{field}'")
+        compiled.append((field, gen_field["func"], gen_field.get("bulk_func"), spec.get("options", {})))
+    return compiled
+
+
+def generate_records(compiled: list[tuple], count: int, start: int = 1) -> list:
+    if not compiled:
+        return [{} for _ in range(count)]
+
+    # Build the records a column at a time so field types with a bulk generator
+    # produce all their values in one call instead of one call per record
+    columns = []
+    for field, gen_func, bulk_func, options in compiled:
+        if bulk_func:
+            columns.append(bulk_func(options, count))
+        else:
+            # Reuse one options dict and only update the index between records
+            field_options = dict(options)
+            column = []
+            for idx in range(start, start + count):
+                field_options["index"] = idx
+                column.append(gen_func(field_options))
+            columns.append(column)
+
+    field_names = [field for field, *_ in compiled]
+    return [dict(zip(field_names, values)) for values in zip(*columns)]
+
+
 def generate_dataset_from_schema(schema: dict, count: int) -> list:
-    return [generate_entry(schema, idx) for idx in range(1, count + 1)]
+    return generate_records(compile_schema(schema), count)
+
+
+def init_generation_worker():
+    # Workers start with a copy of the parent's RNG state, reseed so they don't all produce the same values
+    random.seed()
+    fake.seed_instance(random.getrandbits(64))
+
+
+def generate_records_batch(args: tuple) -> list:
+    schema, start, count = args
+    return generate_records(compile_schema(schema), count, start)
+
+
+def iter_dataset_from_schema(schema: dict, count: int, batch_size: int = 1000):
+    # Compile the schema and load foreign key ids now rather than when the first record is requested,
+    # so schema errors surface before save_generated_data starts writing
+    compiled = compile_schema(schema)
+    prime_foreign_keys(schema)
+    return generate_dataset_batches(schema, compiled, count, batch_size)
+
+
+def generate_dataset_batches(schema: dict, compiled: list[tuple], count: int, batch_size: int):
+    # Yield records in batches so large datasets can be written without holding them all in memory
+    batches = [(start, min(batch_size, count - start + 1)) for start in range(1, count + 1, batch_size)]
+    if count < PARALLEL_THRESHOLD:
+        for start, batch_count in batches:
+            yield from generate_records(compiled, batch_count, start)
+        return
+
+    # Generation is CPU bound, so spread large datasets over every core; imap keeps batches in order
+    with Pool(os.cpu_count(), initializer=init_generation_worker) as pool:
+        tasks = [(schema, start, batch_count) for start, batch_count in batches]
+        for records in pool.imap(generate_records_batch, tasks):
+            yield from records
 
 
 GEN_FIELDS = {
@@ -216,6 +424,7 @@ GEN_FIELDS = {
     },
     "integer": {
         "func": generate_integer,
+        "bulk_func": generate_integer_bulk,
         "options": {
             "min": {"type": int, "default": 0, "description": "Minimum integer value"},
             "max": {"type": int, "default": 100, "description": "Maximum integer value"},
@@ -224,6 +433,7 @@ GEN_FIELDS = {
     },
     "price": {
         "func": generate_price,
+        "bulk_func": generate_price_bulk,
         "options": {
             "min": {"type": float, "default": 0.0, "description": "Minimum price"},
             "max": {"type": float, "default": 1000.0, "description": "Maximum price"},
@@ -233,6 +443,7 @@ GEN_FIELDS = {
     },
     "uuid": {
         "func": generate_uuid,
+        "bulk_func": generate_uuid_bulk,
         "options": {},
         "description": "A random UUID (universally unique identifier)"
     },
@@ -255,6 +466,7 @@ GEN_FIELDS = {
     },
     "phone": {
         "func": generate_phone,
+        "bulk_func": generate_phone_bulk,
         "options": {
             "char_length": {"type": int, "default": 11, "description": "Phone number length"},
             "prefix": {"type": str, "default": "0", "description": "Phone number prefix"},
@@ -263,6 +475,7 @@ GEN_FIELDS = {
     },
     "date": {
         "func": generate_datetime_utc,
+        "bulk_func": generate_datetime_utc_bulk,
         "options": {
             "start_day": {"type": int, "default": 1, "description": "Start day"},
             "start_month": {"type": int, "default": 1, "description": "Start month"},
@@ -345,24 +558,6 @@ def prompt_options(field_type: str) -> dict:
     return answers
 
 
-def generate_entry(schema: dict, idx: int) -> dict:
-    fields = schema.get("fields", {})
-    entry = {}
-    for field, spec in fields.items():
-        field_type = spec.get("type")
-        gen_func = GEN_FIELDS.get(field_type, {}).get("func")
-        options = {
-            **spec.get("options", {}),
-            "index": idx
-        }
-
-        if gen_func:
-            entry[field] = gen_func(options)
-        else:
-            entry[field] = None
-    return entry
-
-
 def generate_linked_dataset():
     # Get the new dataset name
     new_dataset_name = inquirer.text(
@@ -381,7 +576,6 @@ def generate_linked_dataset():
         # Reload with correct structure
         schema = load_schema(new_dataset_name)
         
-    new_data = []
     linked_dataset_name = schema.get("linked_to")
     
     linked_dataset_file = f"{linked_dataset_name}.json"
@@ -391,8 +585,8 @@ def generate_linked_dataset():
         print(f"Linked dataset '{linked_dataset_file}' not found!")
         return
 
-    with open(linked_dataset_file) as f:
-        linked_records = json.load(f)
+    with open(linked_dataset_file, "rb") as f:
+        linked_records = orjson.loads(f.read())
 
     # Set foreign key field name (e.g. posts_id)
     foreign_key_field = f"{linked_dataset_name}_id"
@@ -404,16 +598,43 @@ def generate_linked_dataset():
     max_count = int(inquirer.text(
         message="Maximum number of linked records per parent?").execute())
 
-    for parent_record in linked_records:
+    new_data = iter_linked_records(
+        schema, linked_records, foreign_key_field, min_count, max_count)
+    saved = save_generated_data(new_dataset_name, new_data)
+    print(f"\nSaved {saved} linked records to {new_dataset_name}.json")
+
+
+def iter_linked_records(schema: dict, parent_records: list, foreign_key_field: str, min_count: int, max_count: int,
+                        batch_size: int = 1000):
+    # Compile the schema and load foreign key ids up front, as iter_dataset_from_schema does
+    compiled = compile_schema(schema)
+    prime_foreign_keys(schema)
+    return generate_linked_batches(compiled, parent_records, foreign_key_field, min_count, max_count, batch_size)
+
+
+def generate_linked_batches(compiled: list[tuple], parent_records: list, foreign_key_field: str, min_count: int,
+                            max_count: int, batch_size: int):
+    # Decide how many children each parent gets, generating and yielding them a batch at a time
+    # so the children are written out as they are produced rather than collected first
+    start = 1
+    parent_ids = []
+    for parent_record in parent_records:
         linked_num = random.randint(min_count, max_count)
-        parent_id = parent_record.get("id")
-        for _ in range(linked_num):
-            entry = generate_entry(schema, idx=0)
-            entry[foreign_key_field] = parent_id
-            new_data.append(entry)
+        parent_ids.extend([parent_record.get("id")] * linked_num)
+        if len(parent_ids) >= batch_size:
+            records = generate_records(compiled, len(parent_ids), start)
+            yield from stamp_foreign_keys(records, foreign_key_field, parent_ids)
+            start += len(parent_ids)
+            parent_ids = []
+    if parent_ids:
+        records = generate_records(compiled, len(parent_ids), start)
+        yield from stamp_foreign_keys(records, foreign_key_field, parent_ids)
+
 
-    save_generated_data(new_dataset_name, new_data)
-    print(f"\nSaved {len(new_data)} linked records to {new_dataset_name}.json")
+def stamp_foreign_keys(records: list, foreign_key_field: str, parent_ids: list) -> list:
+    for entry, parent_id in zip(records, parent_ids):
+        entry[foreign_key_field] = parent_id
+    return records
 
 
 def generate_dataset():
@@ -429,7 +650,7 @@ def generate_dataset():
     num_records = int(inquirer.text(
         message="How many records to generate?").execute())
 
-    data = generate_dataset_from_schema(schema, num_records)
+    data = iter_dataset_from_schema(schema, num_records)
 
     save_generated_data(data_set_name, data)
     print(f"\nSaved {num_records} records to {data_set_name}.json")
@@ -1,69 +1,73 @@
-import json
+import orjson
+from io import StringIO
 
 config = dict()
 datasets = dict()
 
 
-def print_value(input) -> str:
+def print_value(input, buf: StringIO):
     if isinstance(input, list):
-        middle = ", ".join([item for item in input])
-        return "[ " + middle + " ]"
-    if isinstance(input, dict):
+        buf.write("[ " + ", ".join([item for item in input]) + " ]")
+    elif isinstance(input, dict):
         if not input:
-            return "(none)"
-        indented_list = [f"  - {key}: {value}" for key, value in input.items()]
-        return "\n" + "\n".join(indented_list)
-    return str(input)
+            buf.write("(none)")
+        for key, value in input.items():
+            buf.write(f"\n  - {key}: {value}")
+    else:
+        buf.write(str(input))
 
 
-def list_dict(input: dict) -> str:
-    items = [f"- {key}: {print_value(value)}" for key, value in input.items()]
-    return "\n".join(items)
+def list_dict(input: dict, buf: StringIO):
+    separator = ""
+    for key, value in input.items():
+        buf.write(f"{separator}- {key}: ")
+        print_value(value, buf)
+        separator = "\n"
 
 
-def list_dict_exclude_keys(input: dict, exclude_keys: set) -> str:
+def list_dict_exclude_keys(input: dict, exclude_keys: set, buf: StringIO):
     filtered = {k: v for k, v in input.items() if k not in exclude_keys}
-    return list_dict(filtered)
+    list_dict(filtered, buf)
 
 
 def load_data():
     global config, datasets
-    with open("config.json", "r") as f:
-        config = json.load(f)
+    with open("config.json", "rb") as f:
+        config = orjson.loads(f.read())
     for endpoint in config.get("routes", []):
         dataset_name = endpoint.get("data_set")
         if dataset_name and dataset_name not in datasets:
-            with open(f"{dataset_name}.json") as dataset:
-                datasets[dataset_name] = json.load(dataset)
+            with open(f"{dataset_name}.json", "rb") as dataset:
+                datasets[dataset_name] = orjson.loads(dataset.read())
 
 
-def generate_middleware_notes() -> str:
+def generate_middleware_notes(buf: StringIO):
     global config
-    mw_notes = []
+    buf.write("## Middleware\n\n")
+    separator = ""
     for name, mw_config in config.get("middleware", {}).items():
-        mw_cfg_notes = list_dict(mw_config)
-        mw_cfg_note = f"### {name}\n" + mw_cfg_notes
-        mw_notes.append(mw_cfg_note)
-    return "## Middleware\n\n" + "\n\n".join(mw_notes)
+        buf.write(f"{separator}### {name}\n")
+        list_dict(mw_config, buf)
+        separator = "\n\n"
 
 
-def generate_dataset_notes() -> str:
+def generate_dataset_notes(buf: StringIO):
     global datasets
-    dataset_notes = []
+    buf.write("## Datasets\n\n")
+    separator = ""
     for name, dataset in datasets.items():
-        ds_fields = [f"{key}" for key in dataset[0]]
-        ds_note = f"### {name}\n" + ", ".join(ds_fields)
+        buf.write(f"{separator}### {name}\n")
+        buf.write(", ".join([f"{key}" for key in dataset[0]]))
         fk_warning = generate_foreign_key_warnings(name)
         if fk_warning:
-            ds_note += "\n\n" + fk_warning
-        dataset_notes.append(ds_note)
-    return "## Datasets\n\n" + "\n\n".join(dataset_notes)
+            buf.write("\n\n" + fk_warning)
+        separator = "\n\n"
 
 
 def generate_foreign_key_warnings(dataset_name):
     try:
-        with open(f"{dataset_name}-config.json") as f:
-            schema = json.load(f)
+        with open(f"{dataset_name}-config.json", "rb") as f:
+            schema = orjson.loads(f.read())
     except FileNotFoundError:
         return ""
 
@@ -88,32 +92,32 @@ def generate_foreign_key_warnings(dataset_name):
     return "\n".join(warning_lines)
 
 
-def generate_endpoint_notes() -> str:
+def generate_endpoint_notes(buf: StringIO):
     global config
-    endpoint_notes = []
+    buf.write("## Endpoints\n\n")
+    separator = ""
     for route in config.get("routes", []):
         endpoint = route.get("endpoint", "")
-        route_notes = list_dict_exclude_keys(route, {"endpoint"})
-        route_note = f"### {endpoint}\n" + route_notes
-        endpoint_notes.append(route_note)
-    return "## Endpoints\n\n" + "\n\n".join(endpoint_notes)
+        buf.write(f"{separator}### {endpoint}\n")
+        list_dict_exclude_keys(route, {"endpoint"}, buf)
+        separator = "\n\n"
 
 
 def main():
+    buf = StringIO()
     with open("template.md", "r") as f:
-        template = f.read()
+        buf.write(f.read())
 
-    # Generate your sections
-    middleware_notes = generate_middleware_notes()
-    dataset_notes = generate_dataset_notes()
-    endpoint_notes = generate_endpoint_notes()
-
-    # Combine everything - you can append the generated notes after the template
-    output = template + "\n\n" + middleware_notes + \
-        "\n\n" + dataset_notes + "\n\n" + endpoint_notes
+    # Generate your sections, appending the generated notes after the template
+    buf.write("\n\n")
+    generate_middleware_notes(buf)
+    buf.write("\n\n")
+    generate_dataset_notes(buf)
+    buf.write("\n\n")
+    generate_endpoint_notes(buf)
 
     with open("output.md", "w") as f:
-        f.write(output)
+        f.write(buf.getvalue())
 
 
 if __name__ == "__main__":
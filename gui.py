@@ -2,8 +2,11 @@ from dearpygui.dearpygui import *
 from server import server
 import time
 from threading import Timer
+from collections import deque
 
-log_messages = []
+# Keep only the last 100 logs to keep UI snappy
+log_messages = deque(maxlen=100)
+_log_dirty = False
 _last_refresh_time = 0
 
 
@@ -33,16 +36,25 @@ def get_middleware_items():
 
 
 def log_info(message):
+    global _log_dirty
     log_messages.append(message)
-    # Limit max logs to last 100 to keep UI snappy
-    if len(log_messages) > 100:
-        log_messages.pop(0)
-    set_value("logger_text", "\n".join(log_messages))
+    # The logger widget is rewritten once per frame in launch_gui, however many logs arrive
+    _log_dirty = True
+
+
+def flush_logs():
+    global _log_dirty
+    if _log_dirty:
+        _log_dirty = False
+        set_value("logger_text", "\n".join(log_messages))
 
 
 def reset_data_callback():
-    server.reset_datasets()
-    log_info("Datasets reset.")
+    errors = server.reset_datasets()
+    if errors:
+        log_info(f"Failed to reset datasets, their current data is kept: {errors}")
+    else:
+        log_info("Datasets reset.")
 
 
 def fail_route_confirm_callback(sender, app_data, user_data):
@@ -50,7 +62,7 @@ def fail_route_confirm_callback(sender, app_data, user_data):
     selected = get_value("route_combo")
     if selected:
         selected = strip_status_prefix(selected)
-        server.fail_next[selected] = True
+        server.set_fail_next(selected)
         configure_item("route_combo", items=get_route_items())
         log_info(f"Set to fail next call to: {selected}")
         set_value("route_combo", "")
@@ -60,7 +72,7 @@ def fail_middleware_confirm_callback(sender, app_data, user_data):
     selected = get_value("middleware_combo")
     if selected:
         selected = f"middleware:{strip_status_prefix(selected)}"
-        server.fail_next[selected] = True
+        server.set_fail_next(selected)
         configure_item("middleware_combo", items=get_middleware_items())
         log_info(f"Set to fail next call to: {selected}")
         set_value("middleware_combo", "")
@@ -107,15 +119,15 @@ def launch_gui():
     setup_dearpygui()
     show_viewport()
 
-    refresh_interval = 1.0  # seconds
-    last_refresh_time = 0
+    last_seen_version = server.state_version
 
     while is_dearpygui_running():
-        now = time.time()
-        if now - last_refresh_time >= refresh_interval:
-            last_refresh_time = now
+        # Only rebuild the dropdowns when a route or failure flag actually changed
+        if server.state_version != last_seen_version:
+            last_seen_version = server.state_version
             configure_item("route_combo", items=get_route_items())
             configure_item("middleware_combo", items=get_middleware_items())
+        flush_logs()
         render_dearpygui_frame()
         time.sleep(0.01)  # tiny sleep to avoid hogging CPU
 
@@ -1,14 +1,19 @@
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
 from fastapi import Request
 from typing import Optional, List
-from pydantic import BaseModel, ValidationError
+from utils.headers import bearer_header, get_raw_header
+from utils.responses import prerender, prerendered_response
+import hmac
 
+# Error bodies never change, so they are serialised once at import
+_MISSING_CONFIG = prerender(
+    {"error": "Missing required config key for auth_token middleware: 'accepted_token'"})
+_MISSING_HEADER = prerender({"error": "Missing Authorization header"})
+_SIMULATED_FAILURE = prerender({"error": "Simulated auth failure"})
+_UNAUTHORIZED = prerender({"error": "Unauthorized"})
 
-class AuthTokenConfig(BaseModel):
-    accepted_token: str
 
-
-async def run(request: Request, config: dict, metadata: dict) -> Optional[JSONResponse]:
+async def run(request: Request, config: dict, metadata: dict) -> Optional[Response]:
     """
     Middleware function to simulate validating presence and correctness of an authorization token. This is required to be in all middleware.
 
@@ -20,33 +25,20 @@ async def run(request: Request, config: dict, metadata: dict) -> Optional[JSONRe
             - "fail_next" (bool): If True, forces a simulated failure once.
 
     Returns:
-        JSONResponse or None: Returns HTTP 401 if no or invalid Authorization header,
+        Response or None: Returns HTTP 401 if no or invalid Authorization header,
         HTTP 401 if simulated failure triggered, HTTP 500 if misconfigured,
         otherwise None to continue processing.
     """
     if "accepted_token" not in config:
-        return JSONResponse(
-            status_code=500,
-            content={
-                "error": "Missing required config key for auth_token middleware: 'accepted_token'"}
-        ), False
-    auth_header = request.headers.get("Authorization")
+        return prerendered_response(_MISSING_CONFIG, 500), False
+    auth_header = get_raw_header(request, b"authorization")
     if not auth_header:
-        return JSONResponse(
-            status_code=401,
-            content={"error": "Missing Authorization header"}
-        ), False
-    accepted_token = config["accepted_token"]
+        return prerendered_response(_MISSING_HEADER, 401), False
     if metadata.get("fail_next"):
-        return JSONResponse(
-            status_code=401,
-            content={"error": "Simulated auth failure"}
-        ), True
-    if auth_header != f"Bearer {accepted_token}":
-        return JSONResponse(
-            status_code=401,
-            content={"error": "Unauthorized"}
-        ), False
+        return prerendered_response(_SIMULATED_FAILURE, 401), True
+    expected = bearer_header(config["accepted_token"])
+    if expected is None or not hmac.compare_digest(auth_header, expected):
+        return prerendered_response(_UNAUTHORIZED, 401), False
     return None, False
 
 
@@ -59,14 +51,19 @@ def validate_config(config: dict) -> Optional[list]:
         config (dict): The configuration dictionary provided for the middleware.
 
     Returns:
-        None if the config is valid, or a list of Pydantic validation errors if invalid.
-        Each error is a dict describing the issue, including the field, message, and type.
+        None if the config is valid, or a list of validation errors if invalid.
+        Each error is a dict describing the issue, including the field, message, and type,
+        in the same shape Pydantic reports them.
     """
-    try:
-        AuthTokenConfig(**config)
-        return None
-    except ValidationError as e:
-        return e.errors()
+    # Single string field, so checked by hand rather than building a Pydantic model
+    if not isinstance(config, dict):
+        return [{"type": "dict_type", "loc": (), "msg": "Input should be a valid dictionary", "input": config}]
+    if "accepted_token" not in config:
+        return [{"type": "missing", "loc": ("accepted_token",), "msg": "Field required", "input": config}]
+    if not isinstance(config["accepted_token"], str):
+        return [{"type": "string_type", "loc": ("accepted_token",), "msg": "Input should be a valid string",
+                 "input": config["accepted_token"]}]
+    return None
 
 
 def validate_metadata(metadata: dict) -> Optional[dict]:
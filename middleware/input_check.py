@@ -1,9 +1,12 @@
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
 from fastapi import Request
 from typing import Optional
+from utils.responses import prerender, prerendered_response
 
+_SIMULATED_FAILURE = prerender({"error": "Simulated input validation failure"})
 
-async def run(request: Request, config: dict, metadata: dict) -> Optional[JSONResponse]:
+
+async def run(request: Request, config: dict, metadata: dict) -> Optional[Response]:
     """
     Middleware function to simulate input validation checks.
 
@@ -14,11 +17,11 @@ async def run(request: Request, config: dict, metadata: dict) -> Optional[JSONRe
             - "fail_next" (bool): If True, forces this middleware to return a failure response once.
 
     Returns:
-        JSONResponse or None: Returns a 400 error response if `fail_next` is set,
+        Response or None: Returns a 400 error response if `fail_next` is set,
         otherwise None to continue processing.
     """
     if metadata.get("fail_next"):
-        return JSONResponse(status_code=400, content={"error": "Simulated input validation failure"}), True
+        return prerendered_response(_SIMULATED_FAILURE, 400), True
     return None, False
 
 
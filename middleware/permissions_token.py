@@ -1,7 +1,18 @@
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
 from fastapi import Request
 from typing import Optional, List, Dict
 from pydantic import BaseModel, ValidationError
+from utils.headers import bearer_header, get_raw_header
+from utils.responses import prerender, prerendered_response
+
+# Error bodies never change, so they are serialised once at import
+_MISSING_CONFIG = prerender(
+    {"error": "Missing required config key for permissions_token middleware: 'accepted_tokens'"})
+_MISSING_METADATA = prerender(
+    {"error": "Missing required metadata key for permissions_token middleware: 'accepted_roles'"})
+_SIMULATED_FAILURE = prerender({"error": "Simulated auth failure"})
+_MISSING_HEADER = prerender({"error": "Missing Authorization header"})
+_UNAUTHORIZED = prerender({"error": "Unauthorized"})
 
 
 class PermissionsTokenMetadata(BaseModel):
@@ -12,54 +23,79 @@ class PermissionsTokenConfig(BaseModel):
     accepted_tokens: Dict[str, str]
 
 
-async def run(request: Request, config: dict, metadata: dict) -> Optional[JSONResponse]:
+async def run(request: Request, config: dict, metadata: dict) -> Optional[Response]:
     """
     Middleware function to simulate validating authorization token against accepted roles and tokens.
 
     Args:
         request (Request): The incoming FastAPI request object.
-        config (dict): Configuration with expected key:
+        config (dict): Configuration with expected keys:
             - "accepted_tokens" (dict): Maps roles to their valid tokens.
+            - "bearer_roles" (dict): The header-to-roles index added by `prepare_config`.
+            - "accepted_roles" (frozenset[str]): The route's accepted roles, added by `prepare_config`.
         metadata (dict): Metadata must include:
             - "accepted_roles" (list[str]): Roles allowed to access the route.
 
     Returns:
-        JSONResponse or None: Returns HTTP 401 if missing or unauthorized token,
+        Response or None: Returns HTTP 401 if missing or unauthorized token,
         HTTP 500 if configuration or metadata is missing,
         otherwise None if the token matches an accepted role.
     """
     if "accepted_tokens" not in config:
-        return JSONResponse(
-            status_code=500,
-            content={
-                "error": "Missing required config key for permissions_token middleware: 'accepted_tokens'"}
-        ), False
+        return prerendered_response(_MISSING_CONFIG, 500), False
     if "accepted_roles" not in metadata:
-        return JSONResponse(
-            status_code=500,
-            content={
-                "error": "Missing required metadata key for permissions_token middleware: 'accepted_roles'"}
-        ), False
+        return prerendered_response(_MISSING_METADATA, 500), False
     if metadata.get("fail_next"):
-        return JSONResponse(
-            status_code=403,
-            content={"error": "Simulated auth failure"}
-        ), True
-    auth_header = request.headers.get("Authorization")
+        return prerendered_response(_SIMULATED_FAILURE, 403), True
+    auth_header = get_raw_header(request, b"authorization")
     if not auth_header:
-        return JSONResponse(
-            status_code=401,
-            content={"error": "Missing Authorization header"}
-        ), False
-    accepted_tokens = config["accepted_tokens"]
-    accepted_roles = metadata["accepted_roles"]
-    for role in accepted_roles:
-        if role in accepted_tokens and auth_header == f"Bearer {accepted_tokens[role]}":
-            return None, False  # Provided token matches user permission required
-    return JSONResponse(
-        status_code=401,
-        content={"error": "Unauthorized"}
-    ), False
+        return prerendered_response(_MISSING_HEADER, 401), False
+    roles = config["bearer_roles"].get(auth_header)
+    if roles is not None and not roles.isdisjoint(config["accepted_roles"]):
+        return None, False  # Provided token matches user permission required
+    return prerendered_response(_UNAUTHORIZED, 401), False
+
+
+def build_bearer_roles(accepted_tokens: dict) -> dict:
+    """
+    Builds a reverse index from each accepted token's Authorization header to the roles it grants,
+    so a request needs a single dict lookup rather than a comparison per role.
+
+    Args:
+        accepted_tokens (dict): Maps roles to their valid tokens.
+
+    Returns:
+        dict: Mapping of encoded "Bearer <token>" headers to a frozenset of the roles sharing that token.
+    """
+    roles_by_header = {}
+    for role, token in accepted_tokens.items():
+        header = bearer_header(token)
+        if header is None:
+            continue  # No request can carry a token latin-1 cannot encode, so it never matches
+        roles_by_header.setdefault(header, set()).add(role)
+    return {header: frozenset(roles) for header, roles in roles_by_header.items()}
+
+
+def prepare_config(config: dict, metadata: dict) -> dict:
+    """
+    Builds the config run receives on a route, once when the route's middleware chain is resolved.
+    The header-to-roles index and the route's accepted roles go on a copy, so neither the user's
+    config nor the route's metadata is written to.
+
+    Args:
+        config (dict): The configuration dictionary provided for the middleware.
+        metadata (dict): The route's metadata.
+
+    Returns:
+        dict: A copy of the config with "bearer_roles" and the "accepted_roles" frozenset added, each
+        left out if the key it is built from is missing for run to report.
+    """
+    prepared = dict(config)
+    if "accepted_tokens" in config:
+        prepared["bearer_roles"] = build_bearer_roles(config["accepted_tokens"])
+    if "accepted_roles" in metadata:
+        prepared["accepted_roles"] = frozenset(metadata["accepted_roles"])
+    return prepared
 
 
 def validate_metadata(metadata: dict) -> Optional[dict]:
@@ -74,7 +110,7 @@ def validate_metadata(metadata: dict) -> Optional[dict]:
         None if metadata provided is sufficient or a dict explaining which metadata is missing or malformed.
     """
     try:
-        PermissionsTokenMetadata(**metadata)
+        PermissionsTokenMetadata.model_validate(metadata)
         return None
     except ValidationError as e:
         return e.errors()
@@ -93,7 +129,7 @@ def validate_config(config: dict) -> Optional[list]:
         Each error is a dict describing the issue, including the field, message, and type.
     """
     try:
-        PermissionsTokenConfig(**config)
+        PermissionsTokenConfig.model_validate(config)
         return None
     except ValidationError as e:
         return e.errors()
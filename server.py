@@ -1,18 +1,46 @@
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
 from typing import Optional, Literal
 import uvicorn
 import utils.collection_utils as collection_utils
+from utils.responses import prerender, prerendered_response, json_response, streamed_list_response
 import importlib
 import uuid
-import json
+import orjson
 import sys
 from datetime import datetime, timezone
 from pydantic import BaseModel, Field, field_validator, ValidationError
 import os
+import re
+import threading
+from collections import OrderedDict
 
 # TODO: refactor metadata to store per route
 
+# Bodies for constant responses are serialised once, a fresh Response wraps them per request
+_ITEM_NOT_FOUND = prerender({"error": "Item not found"})
+_INVALID_JSON = prerender({"error": "Invalid JSON body"})
+_BODY_REQUIRED = prerender({"error": "Request body is required"})
+_MISSING_AUTH_CONFIG = prerender({"error": "Missing config for auth_token"})
+_MISSING_ACCEPTED_TOKEN = prerender({"error": "Missing config for accepted_token"})
+_DELETE_REQUIRES_PARAMS = prerender({"error": "DELETE route requires path or query parameters to locate entry"})
+_NOTHING_TO_DELETE = prerender({"error": "No matching entries found to delete"})
+_PUT_REQUIRES_PARAMS = prerender({"error": "PUT route requires path or query parameters to locate entry"})
+_NOTHING_TO_UPDATE = prerender({"error": "No matching entry found to update"})
+_SIMULATED_FAILURE = prerender({"error": "Simulated failure"})
+_POST_NOT_STORED = prerender({"message": "Successful post, no entries created"})
+
+# Path parameters in a route endpoint, e.g. {id} or {id:int}
+_PATH_PARAM = re.compile(r"\{(\w+)(?::[^}]*)?\}")
+
+# Filtered GET results with more entries than this are streamed rather than serialised in one buffer
+STREAM_THRESHOLD = 5000
+# Filtered GET responses kept per dataset until it next changes
+RESPONSE_CACHE_SIZE = 256
+# Total body bytes those cached responses may hold per dataset, as list bodies can be large
+RESPONSE_CACHE_BYTES = 8 * 1024 * 1024
+
+
 class RouteConfig(BaseModel):
     endpoint: str
     data_set: str
@@ -42,10 +70,29 @@ class JsonServer:
     Attributes:
         app (FastAPI): The FastAPI application instance to which routes will be added.
         data (dict): In-memory storage for datasets managed by the server.
+        indexes (dict): Per dataset, field indexes over its entries as built by collection_utils.build_index.
+        indexed_fields (dict): Per dataset, the fields registered with register_index, always including 'id'.
+        required_fields (dict): Per dataset, the template entry and the fields a POST body must provide, see get_required_fields.
+        dataset_payloads (dict): Per dataset, the serialised body of an unfiltered GET, see get_dataset_payload.
+        response_cache (dict): Per dataset, an LRU of serialised filtered GET responses, see get_cached_response.
+        response_cache_bytes (dict): Per dataset, the total size of the bodies held in its response cache.
+        generations (dict): Per dataset, a counter bumped whenever it is loaded or changes, so a response built
+            from an older copy of the dataset is never cached.
+        dataset_lock (threading.Lock): Held while a dataset's entries and indexes are swapped or read together,
+            as the GUI reloads datasets from its own thread, see get_dataset.
         middleware_config (dict): Configuration dictionary for middleware behavior and tokens.
         middleware (dict): Dictionary of middleware loaded during config parsing
+        fail_next (dict): Simulated failure flags keyed by "METHOD:endpoint" or "middleware:name".
+        routes (set): Registered routes as "METHOD:endpoint" strings.
+        state_version (int): Incremented whenever routes or failure flags change, so the GUI can skip redundant refreshes.
+        routefuncs (dict): Route registration methods keyed by HTTP method.
     """
 
+    __slots__ = (
+        "app", "data", "indexes", "indexed_fields", "required_fields", "dataset_payloads",
+        "response_cache", "response_cache_bytes", "generations", "dataset_lock", "middleware_config", "middleware", "fail_next", "routes",
+        "state_version", "routefuncs")
+
     def __init__(self, app: FastAPI):
         """
         Initializes the JsonServer with a FastAPI app instance.
@@ -54,11 +101,28 @@ class JsonServer:
             app (FastAPI): The FastAPI application where the routes will be registered.
         """
         self.app = app
+        # Compress larger dataset payloads, small bodies such as errors are sent as is
+        self.app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
         self.data = dict()
+        self.indexes = dict()
+        self.indexed_fields = dict()
+        self.required_fields = dict()
+        self.dataset_payloads = dict()
+        self.response_cache = dict()
+        self.response_cache_bytes = dict()
+        self.generations = dict()
+        self.dataset_lock = threading.Lock()
         self.middleware_config = dict()
         self.middleware = dict()
         self.fail_next = dict()
         self.routes = set()
+        self.state_version = 0
+        self.routefuncs = {
+            "GET": self.add_get_route,
+            "POST": self.add_post_route,
+            "PUT": self.add_put_route,
+            "DELETE": self.add_delete_route,
+            "AUTH": self.add_auth_route}
 
     def add_get_route(self, endpoint: str, data_set: str, middleware: list[str] = None, metadata: dict = None):
         """
@@ -71,53 +135,58 @@ class JsonServer:
             metadata (dict, optional): Additional options for route behavior (e.g., singular_response).
 
         Behavior:
-            - Validates the existence of the dataset.
+            - Loads the dataset when the route is added, so it always exists for requests.
             - Runs middleware in order; if any returns a response, it short-circuits.
             - Filters dataset items by path and query parameters.
             - Returns a single entry if `singular_response` is True and exactly one match found.
             - Returns multiple matching entries otherwise.
-            - Returns appropriate error responses if dataset not found, no matches, or multiple matches found for singular.
+            - Returns appropriate error responses if no matches, or multiple matches found for singular.
         """
         metadata = metadata or {}
-        middleware = middleware or []
+        route_key = sys.intern(f"GET:{endpoint}")
+        middleware_chain = self.resolve_middleware(middleware or [], metadata)
+        # Load the dataset now so handlers can rely on it being present
+        self.ensure_dataset_loaded(data_set)
+        # Route behaviour is fixed at registration, so read the metadata flags once
+        singular = bool(metadata.get("singular_response"))
         async def handler(request: Request):
-            if data_set not in self.data:
-                return JSONResponse(
-                    status_code=500,
-                    content={"error": f"dataset {data_set} not found"}
-                )
-            response = self.check_route_failure_flag("GET", endpoint)
+            response = self.check_route_failure_flag(route_key)
             if response:
               return response
-            for middleware_name in middleware:
-                response = await self.run_middleware(middleware_name, request, metadata)
+            for flag_key, run, config in middleware_chain:
+                response = await self.run_middleware(flag_key, run, config, request, metadata)
                 if response:
                     return response
-            path_params = request.path_params
-            query_params = request.query_params
-            filtered = collection_utils.filter_dict(
-                self.data[data_set], {**path_params, **query_params})
+            filters = collection_utils.combine_filters(request.path_params, request.query_params)
+            if filters:
+                cache_key = (route_key, tuple(sorted(filters.items())))
+                cached = self.get_cached_response(data_set, cache_key)
+                if cached is not None:
+                    return prerendered_response(*cached)
+                # Taken before the dataset is read, so a reset from the GUI thread meanwhile stops this being cached
+                generation = self.generations[data_set]
+                entries, indexes = self.get_dataset(data_set)
+                filtered = collection_utils.filter_indexed(entries, filters, indexes)
+            else:
+                cache_key = None
+                filtered = self.data[data_set]  # listing everything, no need to copy the dataset
+                if filtered and not singular:
+                    return prerendered_response(self.get_dataset_payload(data_set), 200)
             if not filtered:
-                return JSONResponse(
-                    status_code=404,
-                    content={"error": "Item not found"}
-                )
-            if metadata.get("singular_response"):
+                body, status_code = _ITEM_NOT_FOUND, 404
+            elif singular:
                 if len(filtered) == 1:
-                    return JSONResponse(
-                        status_code=200,
-                        content=filtered[0]
-                    )
+                    body, status_code = orjson.dumps(filtered[0]), 200
                 else:
-                    return JSONResponse(
-                        status_code=400,
-                        content={
-                            "error": f"{len(filtered)} entries found, this endpoint expects a single entry to be found."}
-                    )
-            return JSONResponse(
-                status_code=200,
-                content={"data": filtered}
-            )
+                    body, status_code = orjson.dumps({
+                        "error": f"{len(filtered)} entries found, this endpoint expects a single entry to be found."}), 400
+            elif len(filtered) > STREAM_THRESHOLD:
+                return streamed_list_response("data", filtered)
+            else:
+                body, status_code = orjson.dumps({"data": filtered}), 200
+            if cache_key is not None:
+                self.cache_response(data_set, cache_key, body, status_code, generation)
+            return prerendered_response(body, status_code)
         self.app.get(endpoint)(handler)
 
     def add_post_route(self, endpoint: str, data_set: str, middleware: list[str] = None, metadata: dict = None):
@@ -131,7 +200,7 @@ class JsonServer:
             metadata (dict, optional): Options affecting entry creation, such as auto-generating UUID, timestamps.
 
         Behavior:
-            - Validates the existence of the dataset.
+            - Loads the dataset when the route is added, so it always exists for requests.
             - Runs middleware before processing.
             - Parses JSON request body.
             - Optionally adds UUID, created_at, updated_at fields based on metadata flags.
@@ -139,59 +208,47 @@ class JsonServer:
             - Returns the created entry or success message accordingly.
         """
         metadata = metadata or {}
-        middleware = middleware or []
+        route_key = sys.intern(f"POST:{endpoint}")
+        middleware_chain = self.resolve_middleware(middleware or [], metadata)
+        # Load the dataset now so handlers can rely on it being present
+        self.ensure_dataset_loaded(data_set)
+        # Route behaviour is fixed at registration, so read the metadata flags once
+        creates_entry = bool(metadata.get("creates_entry"))
+        creates_created_at = bool(metadata.get("creates_created_at"))
+        creates_updated_at = bool(metadata.get("creates_updated_at"))
         async def handler(request: Request):
-            if data_set not in self.data:
-                return JSONResponse(
-                    status_code=500,
-                    content={"error": f"dataset {data_set} not found"}
-                )
-            response = self.check_route_failure_flag("POST", endpoint)
+            response = self.check_route_failure_flag(route_key)
             if response:
               return response
-            for middleware_name in middleware:
-                response = await self.run_middleware(middleware_name, request, metadata)
+            for flag_key, run, config in middleware_chain:
+                response = await self.run_middleware(flag_key, run, config, request, metadata)
                 if response:
                     return response
             try:
-                body = await request.json()
-            except Exception:
-                return JSONResponse(
-                    status_code=400,
-                    content={"error": "Invalid JSON body"}
-                )
+                body = orjson.loads(await request.body())
+            except orjson.JSONDecodeError:
+                return prerendered_response(_INVALID_JSON, 400)
 
             if not body:
-                return JSONResponse(
-                    status_code=400,
-                    content={"error": "Request body is required"}
-                )
+                return prerendered_response(_BODY_REQUIRED, 400)
             # Validation against dataset shape
-            template = self.data[data_set][0] if self.data[data_set] else {}
-            missing_fields = [k for k in template.keys() if k != 'id' and k not in body]
+            missing_fields = [k for k in self.get_required_fields(data_set) if k not in body]
 
             if missing_fields:
-                return JSONResponse(
-                    status_code=400,
-                    content={
-                        "error": f"Missing required fields: {missing_fields}"}
-                )
+                return json_response({"error": f"Missing required fields: {missing_fields}"}, 400)
             body["id"] = str(uuid.uuid4())
-            if metadata.get("creates_created_at"):
+            if creates_created_at:
                 body["created_at"] = datetime.now(timezone.utc).isoformat()
-            if metadata.get("creates_updated_at"):
+            if creates_updated_at:
                 body["updated_at"] = None
-            if metadata.get("creates_entry"):
-                self.data[data_set].append(body)
-                return JSONResponse(
-                    status_code=200,
-                    content=body
-                )
+            if creates_entry:
+                entries, indexes = self.get_dataset(data_set)
+                entries.append(body)
+                self.index_entries(indexes, [body])
+                self.invalidate_dataset_cache(data_set)
+                return json_response(body, 200)
             else:
-                return JSONResponse(
-                    status_code=200,
-                    content={"message": "Successful post, no entries created"}
-                )
+                return prerendered_response(_POST_NOT_STORED, 200)
         self.app.post(endpoint)(handler)
         
     def add_auth_route(self, endpoint: str, data_set: str, middleware: list[str] = None, metadata: dict = None):
@@ -212,20 +269,11 @@ class JsonServer:
         async def handler(request: Request):
             cfg = self.middleware_config.get("auth_token")
             if not cfg:
-                return JSONResponse(
-                    status_code=500,
-                    content={"error": "Missing config for auth_token"}
-                )
+                return prerendered_response(_MISSING_AUTH_CONFIG, 500)
             token = cfg.get("accepted_token")
             if not token:
-                return JSONResponse(
-                    status_code=500,
-                    content={"error": "Missing config for accepted_token"}
-                )
-            return JSONResponse(
-                    status_code=200,
-                    content={"token": token}
-                )
+                return prerendered_response(_MISSING_ACCEPTED_TOKEN, 500)
+            return json_response({"token": token}, 200)
         self.app.post(endpoint)(handler)
 
     def add_delete_route(self, endpoint: str, data_set: str, middleware: list[str] = None, metadata: dict = None):
@@ -239,7 +287,7 @@ class JsonServer:
             metadata (dict, optional): Options such as 'singular_response' to enforce deleting exactly one entry.
 
         Behavior:
-            - Validates dataset existence.
+            - Loads the dataset when the route is added, so it always exists for requests.
             - Runs middleware checks.
             - Requires path or query parameters to identify entries to delete.
             - Filters entries matching parameters.
@@ -248,53 +296,48 @@ class JsonServer:
             - Returns deleted entries or errors accordingly.
         """
         metadata = metadata or {}
-        middleware = middleware or []
+        route_key = sys.intern(f"DELETE:{endpoint}")
+        middleware_chain = self.resolve_middleware(middleware or [], metadata)
+        # Load the dataset now so handlers can rely on it being present
+        self.ensure_dataset_loaded(data_set)
+        # Route behaviour is fixed at registration, so read the metadata flags once
+        singular = bool(metadata.get("singular_response"))
         async def handler(request: Request):
-            if data_set not in self.data:
-                return JSONResponse(
-                    status_code=500,
-                    content={"error": f"dataset {data_set} not found"}
-                )
-            response = self.check_route_failure_flag("DELETE", endpoint)
+            response = self.check_route_failure_flag(route_key)
             if response:
               return response
-            for middleware_name in middleware:
-                response = await self.run_middleware(middleware_name, request, metadata)
+            for flag_key, run, config in middleware_chain:
+                response = await self.run_middleware(flag_key, run, config, request, metadata)
                 if response:
                     return response
             path_params = request.path_params
             query_params = request.query_params
             if not path_params and not query_params:
-                return JSONResponse(
-                    status_code=500,
-                    content={
-                        "error": "DELETE route requires path or query parameters to locate entry"}
-                )
-            to_delete = collection_utils.filter_dict(
-                self.data[data_set], {**path_params, **query_params})
+                return prerendered_response(_DELETE_REQUIRES_PARAMS, 500)
+            # Work on one snapshot of the entries and their indexes, so a reset from the GUI thread
+            # meanwhile cannot pair the swept list with indexes from another copy
+            entries, indexes = self.get_dataset(data_set)
+            to_delete = collection_utils.filter_indexed(
+                entries, collection_utils.combine_filters(path_params, query_params), indexes)
             if not to_delete:
-                return JSONResponse(
-                    status_code=404,
-                    content={"error": "No matching entries found to delete"}
-                )
-            if metadata.get("singular_response") and len(to_delete) != 1:
-                return JSONResponse(
-                    status_code=400,
-                    content={
-                        "error": f"{len(to_delete)} entries found, this endpoint expects a single entry to be found."}
-                )
+                return prerendered_response(_NOTHING_TO_DELETE, 404)
+            if singular and len(to_delete) != 1:
+                return json_response({
+                    "error": f"{len(to_delete)} entries found, this endpoint expects a single entry to be found."}, 400)
             # Actually remove matching items
-            to_delete_ids = {item['id'] for item in to_delete}
-
-            self.data[data_set] = [
-                item for item in self.data[data_set] if item.get('id') not in to_delete_ids
-            ]
-
-            return JSONResponse(
-                status_code=200,
-                content=to_delete[0] if metadata.get(
-                    "singular_response") else to_delete
-            )
+            # Matches are references into the dataset, so identify them by object identity
+            to_delete_ids = {id(item) for item in to_delete}
+            # Sweep kept entries down in place rather than copying the whole list for each delete
+            write = 0
+            for item in entries:
+                if id(item) not in to_delete_ids:
+                    entries[write] = item
+                    write += 1
+            del entries[write:]
+            self.unindex_entries(indexes, to_delete)
+            self.invalidate_dataset_cache(data_set)
+
+            return json_response(to_delete[0] if singular else to_delete, 200)
         self.app.delete(endpoint)(handler)
 
     def add_put_route(self, endpoint: str, data_set: str, middleware: list[str] = None, metadata: dict = None):
@@ -308,7 +351,7 @@ class JsonServer:
             metadata (dict, optional): Additional route behavior metadata.
 
         Behavior:
-            - Validates dataset existence.
+            - Loads the dataset when the route is added, so it always exists for requests.
             - Runs middleware before processing.
             - Requires path or query parameters to locate the entry to update.
             - Accepts JSON body with update data.
@@ -317,109 +360,139 @@ class JsonServer:
             - Returns the updated entry or relevant errors.
         """
         metadata = metadata or {}
-        middleware = middleware or []
+        route_key = sys.intern(f"PUT:{endpoint}")
+        middleware_chain = self.resolve_middleware(middleware or [], metadata)
+        # Load the dataset now so handlers can rely on it being present
+        self.ensure_dataset_loaded(data_set)
         async def handler(request: Request):
-            if data_set not in self.data:
-                return JSONResponse(
-                    status_code=500,
-                    content={"error": f"dataset {data_set} not found"}
-                )
-            response = self.check_route_failure_flag("PUT", endpoint)
+            response = self.check_route_failure_flag(route_key)
             if response:
               return response
-            for middleware_name in middleware:
-                response = await self.run_middleware(middleware_name, request, metadata)
+            for flag_key, run, config in middleware_chain:
+                response = await self.run_middleware(flag_key, run, config, request, metadata)
                 if response:
                     return response
-            try:
-                body = await request.json()
-            except Exception:
-                return JSONResponse(
-                    status_code=400,
-                    content={"error": "Invalid JSON body"}
-                )
-
-            if not body:
-                return JSONResponse(
-                    status_code=400,
-                    content={"error": "Request body is required"}
-                )
             path_params = request.path_params
             query_params = request.query_params
             if not path_params and not query_params:
-                return JSONResponse(
-                    status_code=400,
-                    content={
-                        "error": "PUT route requires path or query parameters to locate entry"}
-                )
-            to_update = collection_utils.filter_dict(
-                self.data[data_set], {**path_params, **query_params})
+                return prerendered_response(_PUT_REQUIRES_PARAMS, 400)
+            try:
+                body = orjson.loads(await request.body())
+            except orjson.JSONDecodeError:
+                return prerendered_response(_INVALID_JSON, 400)
+
+            if not body:
+                return prerendered_response(_BODY_REQUIRED, 400)
+            entries, indexes = self.get_dataset(data_set)
+            to_update = collection_utils.filter_indexed(
+                entries, collection_utils.combine_filters(path_params, query_params), indexes)
             if not to_update:
-                return JSONResponse(
-                    status_code=404,
-                    content={"error": "No matching entry found to update"}
-                )
+                return prerendered_response(_NOTHING_TO_UPDATE, 404)
             if len(to_update) != 1:
-                return JSONResponse(
-                    status_code=400,
-                    content={
-                        "error": f"{len(to_update)} entries found, this endpoint expects a single entry to be found."}
-                )
+                return json_response({
+                    "error": f"{len(to_update)} entries found, this endpoint expects a single entry to be found."}, 400)
             # Check shape of body matches the object stored (all keys except 'id')
             to_update_item = to_update[0]
             expected_fields = set(to_update_item.keys()) - {"id"}
             provided_fields = set(body.keys())
             missing_fields = expected_fields - provided_fields
             if missing_fields:
-                return JSONResponse(
-                    status_code=400,
-                    content={
-                        "error": f"Missing fields in request body: {', '.join(missing_fields)}"
-                    }
-                )
+                return json_response(
+                    {"error": f"Missing fields in request body: {', '.join(missing_fields)}"}, 400)
             # Actually update existing item
             existing_id = to_update_item.get("id")
+            previous = {field: str(to_update_item.get(field)) for field in indexes}
             to_update_item.clear()
             to_update_item.update(body)
             to_update_item["id"] = existing_id
-            return JSONResponse(
-                status_code=200,
-                content=to_update_item
-            )
+            for field, value in previous.items():
+                if str(to_update_item.get(field)) != value:
+                    # Re-adding the entry would put it out of dataset order in its new bucket,
+                    # so drop the index for get_dataset to rebuild on its next lookup
+                    del indexes[field]
+            if to_update_item is entries[0]:
+                self.required_fields.pop(data_set, None)  # the template entry was reshaped
+            self.invalidate_dataset_cache(data_set)
+            return json_response(to_update_item, 200)
         self.app.put(endpoint)(handler)
     
     
-    def check_route_failure_flag(self, method, endpoint):
-      route_key = f"{method}:{endpoint}"
+    def check_route_failure_flag(self, route_key):
+      if not self.fail_next:
+          return None
       if self.fail_next.get(route_key, False):
           # Respond with 500 error (simulated failure)
-          self.fail_next[route_key] = False  # reset flag
-          return JSONResponse(status_code=500, content={"error": "Simulated failure"})
+          self.set_fail_next(route_key, False)  # reset flag
+          return prerendered_response(_SIMULATED_FAILURE, 500)
 
-    async def run_middleware(self, name: str, request: Request, metadata: dict):
+    def resolve_middleware(self, names: list[str], metadata: dict) -> tuple:
+        """
+        Resolves a route's middleware names to their run functions and config once, at registration.
+        A middleware that defines prepare_config(config, metadata) has it called here, so anything it
+        derives from its config for the route is built once rather than on every request.
+
+        Args:
+            names (list[str]): The middleware names configured for the route, in order.
+            metadata (dict): The route's metadata.
+
+        Returns:
+            tuple: (flag_key, run, config) entries for the route handler to call in order, where
+                   flag_key is the middleware's "middleware:<name>" failure flag key.
+
+        Raises:
+            ValueError: If a middleware has not been loaded from the middleware config.
         """
-        Executes the specified middleware module on the given request.
+        chain = []
+        for name in names:
+            mod = self.middleware.get(name)
+            if not mod:
+                raise ValueError(f"Middleware not found for {name}")
+            config = self.middleware_config.get(name, {})
+            prepare_config = getattr(mod, "prepare_config", None)
+            if prepare_config is not None:
+                config = prepare_config(config, metadata)
+            chain.append((f"middleware:{name}", mod.run, config))
+        return tuple(chain)
+
+    async def run_middleware(self, flag_key: str, run, config: dict, request: Request, metadata: dict):
+        """
+        Executes a resolved middleware run function on the given request.
 
         Args:
-            name (str): The name of the middleware module to run from self.middleware.
+            flag_key (str): The middleware's simulated failure flag key, "middleware:<name>".
+            run: The middleware module's run coroutine function.
+            config (dict): The middleware's config from the middleware config.
             request (Request): The FastAPI request object.
             metadata (dict): Additional route behavior metadata.
 
         Returns:
             Response or None: Middleware response if it blocks the request, or None to continue.
         """
-        metadata = dict(metadata)
-        mod = self.middleware.get(name)
-        if not mod:
-            raise Exception(f"Middleware not found for {name}")
-        config = self.middleware_config.get(name, {})
-        # Inject fail_next flag into metadata, run middleware and clear flag if failure was simulated
-        metadata["fail_next"] = self.fail_next.get(f"middleware:{name}", False)
-        response, should_clear_flag = await mod.run(request, config, metadata)
+        # Inject fail_next flag into a copy of the metadata only when it is set, the shared route
+        # metadata is passed as is otherwise, then clear the flag if failure was simulated
+        if self.fail_next and self.fail_next.get(flag_key):
+            metadata = {**metadata, "fail_next": True}
+        response, should_clear_flag = await run(request, config, metadata)
         if should_clear_flag:
-            self.fail_next[f"middleware:{name}"] = False
+            self.set_fail_next(flag_key, False)
         return response
 
+    def set_fail_next(self, key: str, value: bool = True):
+        """
+        Sets or clears a simulated failure flag and bumps the state version.
+
+        Args:
+            key (str): "METHOD:endpoint" for a route or "middleware:name" for a middleware.
+            value (bool): True to fail the next matching call, False to clear the flag.
+        """
+        # Cleared flags are removed rather than stored as False, so fail_next is empty while
+        # nothing is queued and the request-time checks can skip the lookup entirely
+        if value:
+            self.fail_next[key] = True
+        else:
+            self.fail_next.pop(key, None)
+        self.state_version += 1
+
     def parse_config(self):
         """
         Loads and validates the route configuration from 'config.json'.
@@ -436,9 +509,9 @@ class JsonServer:
                         route definitions that fail validation.
         """
         try:
-            with open("config.json", "r") as file:
-                raw_config = json.load(file)
-        except json.JSONDecodeError as e:
+            with open("config.json", "rb") as file:
+                raw_config = orjson.loads(file.read())
+        except orjson.JSONDecodeError as e:
             print(f"Malformed config.json: {e}")
             sys.exit(1)
         # verify correct structure
@@ -454,23 +527,29 @@ class JsonServer:
             route_config = raw_config.get("routes", [])
             routes = [RouteConfig(**route) for route in route_config]
             for route in routes:
+                metadata = route.metadata if route.metadata is not None else {}
+                errors = self.validate_route_metadata(route.middleware or [], metadata)
+                if errors:
+                    print(f"Invalid metadata for route {route.method}:{route.endpoint}: {errors}")
+                    sys.exit(1)
                 self.routes.add(f"{route.method}:{route.endpoint}")
-                routefuncs = {
-                    "GET": self.add_get_route,
-                    "POST": self.add_post_route,
-                    "PUT": self.add_put_route,
-                    "DELETE": self.add_delete_route,
-                    "AUTH": self.add_auth_route}
-                routefuncs[route.method](
-                    route.endpoint, route.data_set, route.middleware, route.metadata)
-                self.ensure_dataset_loaded(route.data_set)
+                self.state_version += 1
+                try:
+                    self.routefuncs[route.method](
+                        route.endpoint, route.data_set, route.middleware, metadata)
+                except ValueError as e:
+                    # Invalid seed data for the route's dataset, or middleware that was never loaded
+                    print(f"Failed to register route {route.method}:{route.endpoint}: {e}")
+                    sys.exit(1)
+                for field in _PATH_PARAM.findall(route.endpoint):
+                    self.register_index(route.data_set, field)
         except ValidationError as e:
             print(f"Config validation error:\n{e}")
 
     def load_seed_data(self, filepath: str):
         try:
-            with open(filepath, "r") as f:
-                seed_data = json.load(f)
+            with open(filepath, "rb") as f:
+                seed_data = orjson.loads(f.read())
             if not isinstance(seed_data, list):
                 raise ValueError(
                     f"Seed file {filepath} does not contain a list")
@@ -499,14 +578,66 @@ class JsonServer:
                         f"'validate_config' function not found in '{key}.py'."]
                 except Exception as e:
                     errors[key] = [f"Error validating {key}: {str(e)}"]
+        return errors
+
+    def validate_route_metadata(self, names: list[str], metadata: dict) -> dict:
+        """
+        Runs each middleware's validate_metadata against a route's metadata. The metadata is only read here,
+        values a middleware derives from it belong in its prepare_config, see resolve_middleware.
+
+        Args:
+            names (list[str]): The middleware names configured for the route.
+            metadata (dict): The route's metadata.
+
+        Returns:
+            dict: Validation errors keyed by middleware name, empty if the metadata is valid.
+        """
+        errors = {}
+        for name in names:
+            mod = self.middleware.get(name)
+            if not mod:
+                continue  # reported by resolve_middleware when the route is added
+            try:
+                validation_errors = mod.validate_metadata(metadata)
+                if validation_errors:
+                    errors[name] = validation_errors
+            except AttributeError:
+                errors[name] = [
+                    f"'validate_metadata' function not found in '{name}.py'."]
+            except Exception as e:
+                errors[name] = [f"Error validating metadata for {name}: {str(e)}"]
+        return errors
 
     def ensure_dataset_loaded(self, data_set: str):
         if data_set not in self.data:
-            data = self.load_seed_data(f"{data_set}.json")
+            self.load_dataset(data_set)
 
-            if not isinstance(data, list):
-                raise ValueError(f"Dataset {data_set} must be a list")
+    def load_dataset(self, data_set: str):
+        """
+        Loads and validates a dataset from its seed file, replacing any copy already held.
+        Its indexes are built before the data is swapped in, so requests never see the dataset missing,
+        and both are swapped under dataset_lock, so get_dataset never returns the new entries with the old indexes.
 
+        Args:
+            data_set (str): The dataset to load from '<data_set>.json'.
+
+        Raises:
+            ValueError: If the seed data is not a list of objects with unique, non-empty ids.
+        """
+        data = self.load_seed_data(f"{data_set}.json")
+
+        if not isinstance(data, list):
+            raise ValueError(f"Dataset {data_set} must be a list")
+
+        # Seed files are usually well formed, so check every id in bulk first and only walk
+        # the entries one by one to report the first problem when that check fails
+        try:
+            ids = [item.get("id") for item in data]
+            valid = all(ids) and len(set(ids)) == len(ids)
+        except (AttributeError, TypeError):
+            valid = False  # a non-object entry or an unhashable id
+
+        if not valid:
             ids = set()
             for idx, item in enumerate(data):
                 if not isinstance(item, dict):
@@ -521,18 +652,205 @@ class JsonServer:
                         f"Duplicate id '{unique_id}' found in dataset {data_set}")
                 ids.add(unique_id)
 
+        indexes = {
+            field: collection_utils.build_index(data, field)
+            for field in self.indexed_fields.setdefault(data_set, ["id"])
+        }
+        with self.dataset_lock:
             self.data[data_set] = data
+            self.indexes[data_set] = indexes
+        self.generations[data_set] = self.generations.get(data_set, 0) + 1
+
+    def register_index(self, data_set: str, field: str):
+        """
+        Keeps an index on a dataset field so lookups filtering on it skip the full scan. Routes register
+        an index for each path parameter in their endpoint, 'id' is always indexed.
+
+        Args:
+            data_set (str): The dataset to index.
+            field (str): The entry field to index on.
+        """
+        fields = self.indexed_fields.setdefault(data_set, ["id"])
+        if field not in fields:
+            fields.append(field)
+            if data_set in self.indexes:
+                self.indexes[data_set][field] = collection_utils.build_index(self.data[data_set], field)
+
+    def get_dataset(self, data_set: str) -> tuple[list[dict], dict]:
+        """
+        Returns a dataset's entries together with their field indexes, rebuilding any index a PUT invalidated.
+        Both are read under dataset_lock, which load_dataset holds while swapping them, so a reload from the
+        GUI thread never pairs one copy's entries with another copy's indexes.
+
+        Args:
+            data_set (str): The dataset being queried.
+
+        Returns:
+            tuple: The dataset's entries, and its indexes keyed by field as accepted by
+                   collection_utils.filter_indexed.
+        """
+        with self.dataset_lock:
+            data = self.data[data_set]
+            indexes = self.indexes[data_set]
+        fields = self.indexed_fields[data_set]
+        if len(indexes) != len(fields):
+            for field in fields:
+                if field not in indexes:
+                    indexes[field] = collection_utils.build_index(data, field)
+        return data, indexes
+
+    def get_required_fields(self, data_set: str) -> tuple:
+        """
+        Returns the fields a POST body must provide, taken from the first entry in the dataset as its template.
+        The result is cached against the template entry itself, so it is recomputed once a different entry
+        becomes first, and PUT drops it when it reshapes the template in place.
+
+        Args:
+            data_set (str): The dataset being posted to.
+
+        Returns:
+            tuple: The template entry's keys other than 'id', in order.
+        """
+        data = self.data[data_set]
+        template = data[0] if data else None
+        cached = self.required_fields.get(data_set)
+        if cached is not None and cached[0] is template:
+            return cached[1]
+        required = tuple(k for k in template.keys() if k != 'id') if template is not None else ()
+        self.required_fields[data_set] = (template, required)
+        return required
+
+    def get_dataset_payload(self, data_set: str) -> bytes:
+        """
+        Returns the serialised {"data": [...]} body for an unfiltered GET on a dataset, encoding it only
+        on the first request after the dataset last changed.
+
+        Args:
+            data_set (str): The dataset being listed.
+
+        Returns:
+            bytes: The JSON body listing every entry in the dataset.
+        """
+        payload = self.dataset_payloads.get(data_set)
+        if payload is None:
+            generation = self.generations[data_set]
+            payload = orjson.dumps({"data": self.data[data_set]})
+            # Only keep it if the dataset was not reloaded or changed while it was encoded
+            if self.generations[data_set] == generation:
+                self.dataset_payloads[data_set] = payload
+        return payload
+
+    def get_cached_response(self, data_set: str, key: tuple) -> Optional[tuple]:
+        """
+        Looks up a filtered GET response cached for a dataset, marking it as recently used.
+
+        Args:
+            data_set (str): The dataset the response was built from.
+            key (tuple): The route key and sorted filter items identifying the request.
 
-    def reset_datasets(self):
+        Returns:
+            tuple or None: The cached (body, status_code), or None if it is not cached.
+        """
+        cache = self.response_cache.get(data_set)
+        if cache is None:
+            return None
+        entry = cache.get(key)
+        if entry is not None:
+            cache.move_to_end(key)
+        return entry
+
+    def cache_response(self, data_set: str, key: tuple, body: bytes, status_code: int, generation: int):
+        """
+        Caches a serialised filtered GET response until the dataset changes, evicting the least recently
+        used responses once more than RESPONSE_CACHE_SIZE, or more than RESPONSE_CACHE_BYTES of bodies, are
+        held for the dataset. Nothing is cached if the dataset has changed since the response was built,
+        or if the body alone exceeds RESPONSE_CACHE_BYTES.
+
+        Args:
+            data_set (str): The dataset the response was built from.
+            key (tuple): The route key and sorted filter items identifying the request.
+            body (bytes): The serialised response body.
+            status_code (int): The response status code.
+            generation (int): The dataset's generation when the response was built.
+        """
+        if self.generations[data_set] != generation or len(body) > RESPONSE_CACHE_BYTES:
+            return
+        cache = self.response_cache.get(data_set)
+        if cache is None:
+            cache = self.response_cache[data_set] = OrderedDict()
+        total = self.response_cache_bytes.get(data_set, 0) + len(body)
+        replaced = cache.pop(key, None)
+        if replaced is not None:
+            total -= len(replaced[0])
+        cache[key] = (body, status_code)
+        while len(cache) > RESPONSE_CACHE_SIZE or total > RESPONSE_CACHE_BYTES:
+            _, (evicted, _) = cache.popitem(last=False)
+            total -= len(evicted)
+        self.response_cache_bytes[data_set] = total
+
+    def invalidate_dataset_cache(self, data_set: str):
+        """
+        Drops responses cached from a dataset's contents. Must be called after every change to the dataset.
+        The dataset's generation is bumped too, so responses being built from its old contents are not cached.
+
+        Args:
+            data_set (str): The dataset that changed.
+        """
+        self.generations[data_set] += 1
+        self.dataset_payloads.pop(data_set, None)
+        self.response_cache.pop(data_set, None)
+        self.response_cache_bytes.pop(data_set, None)
+
+    def index_entries(self, indexes: dict, items: list[dict]):
+        """
+        Adds newly stored entries to every index kept for their dataset.
+
+        Args:
+            indexes (dict): The dataset's indexes, as returned with its entries by get_dataset.
+            items (list[dict]): The added entries.
+        """
+        for field, index in indexes.items():
+            for item in items:
+                collection_utils.index_entry(index, item, field)
+
+    def unindex_entries(self, indexes: dict, items: list[dict]):
+        """
+        Removes deleted entries from every index kept for their dataset.
+
+        Args:
+            indexes (dict): The dataset's indexes, as returned with its entries by get_dataset.
+            items (list[dict]): The removed entries.
+        """
+        for field, index in indexes.items():
+            collection_utils.unindex_entries(index, items, field)
+
+    def reset_datasets(self) -> dict:
         """
         Reloads all previously loaded datasets from their corresponding JSON files,
         effectively resetting them to their original seed state.
+
+        Each dataset's cached responses are dropped as soon as it is swapped in. A dataset whose seed
+        file fails validation keeps its current data and caches, and is reported rather than reset.
+
+        Returns:
+            dict: Errors keyed by the datasets that could not be reset, empty if all were reset.
         """
         loaded_keys = list(self.data.keys())
-        self.data.clear()
+        errors = {}
+        # Swap each dataset in place of the old one rather than clearing them all first,
+        # as handlers no longer check that their dataset exists
         for key in loaded_keys:
-            self.ensure_dataset_loaded(key)
-        print(f"Reset datasets: {loaded_keys}")
+            try:
+                self.load_dataset(key)
+            except ValueError as e:
+                errors[key] = str(e)
+                continue
+            self.invalidate_dataset_cache(key)
+            self.required_fields.pop(key, None)
+        if errors:
+            print(f"Failed to reset datasets: {errors}")
+        print(f"Reset datasets: {[key for key in loaded_keys if key not in errors]}")
+        return errors
 
 app = FastAPI()
 server = JsonServer(app)
@@ -0,0 +1,49 @@
+import importlib
+import json
+import os
+import tempfile
+import unittest
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+
+class FakeRequest:
+    """Carries just the ASGI scope the middleware reads headers from."""
+
+    def __init__(self, headers: list[tuple[bytes, bytes]]):
+        self.scope = {"headers": headers}
+
+
+class ServerTestCase(unittest.TestCase):
+    """Runs each test in its own directory, where start_server writes the config and seed files it serves."""
+
+    def setUp(self):
+        self.previous_cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(os.chdir, self.previous_cwd)
+
+    def start_server(self, routes: list[dict], datasets: dict[str, list[dict]]):
+        """
+        Writes config.json and a seed file per dataset, then builds a JsonServer from them as the
+        server module does on startup.
+
+        Args:
+            routes (list[dict]): Route definitions as they appear in config.json.
+            datasets (dict[str, list[dict]]): Seed entries keyed by dataset name.
+
+        Returns:
+            tuple: A TestClient for the server's app, and the JsonServer itself.
+        """
+        with open("config.json", "w") as f:
+            json.dump({"routes": routes}, f)
+        for name, entries in datasets.items():
+            with open(f"{name}.json", "w") as f:
+                json.dump(entries, f)
+        # The server module parses config.json from the working directory when first imported
+        server = importlib.import_module("server")
+        json_server = server.JsonServer(FastAPI())
+        json_server.parse_config()
+        return TestClient(json_server.app), json_server
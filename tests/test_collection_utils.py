@@ -0,0 +1,109 @@
+import unittest
+
+import utils.collection_utils as collection_utils
+
+
+class UnindexEntriesTest(unittest.TestCase):
+    def setUp(self):
+        # Many rows sharing one user_id alongside a few others, so the shared bucket is large
+        self.shared = [{"id": i, "user_id": 1} for i in range(200)]
+        self.others = [{"id": 200 + i, "user_id": 2 + i % 3} for i in range(30)]
+        self.data = self.shared + self.others
+        self.index = collection_utils.build_index(self.data, "user_id")
+
+    def test_removes_shared_bucket(self):
+        collection_utils.unindex_entries(self.index, self.shared, "user_id")
+
+        self.assertNotIn("1", self.index)
+        self.assertEqual(self.index, collection_utils.build_index(self.others, "user_id"))
+
+    def test_removes_rows_across_buckets(self):
+        collection_utils.unindex_entries(self.index, self.shared + self.others[:3], "user_id")
+
+        self.assertEqual(self.index, collection_utils.build_index(self.others[3:], "user_id"))
+        # Survivors are the dataset's own entries, not copies
+        survivors = [entry for bucket in self.index.values() for entry in bucket]
+        self.assertTrue(all(any(entry is other for other in self.others[3:]) for entry in survivors))
+
+    def test_keeps_survivors_in_dataset_order(self):
+        victims = self.shared[::2]
+        collection_utils.unindex_entries(self.index, victims, "user_id")
+
+        self.assertEqual([entry["id"] for entry in self.index["1"]], [entry["id"] for entry in self.shared[1::2]])
+
+    def test_matches_by_identity(self):
+        # An equal but distinct dict must not remove the indexed entry
+        collection_utils.unindex_entries(self.index, [dict(self.others[0])], "user_id")
+
+        self.assertEqual(self.index, collection_utils.build_index(self.data, "user_id"))
+        self.assertTrue(any(entry is self.others[0] for entry in self.index[str(self.others[0]["user_id"])]))
+
+    def test_ignores_values_missing_from_index(self):
+        collection_utils.unindex_entries(self.index, [{"id": -1, "user_id": 99}], "user_id")
+
+        self.assertNotIn("99", self.index)
+        self.assertEqual(len(self.index["1"]), len(self.shared))
+
+
+class FilterDictTest(unittest.TestCase):
+    def setUp(self):
+        self.data = [{"id": 1, "team": "x"}, {"id": 2}, {"id": "3", "team": None}]
+
+    def test_missing_key_compares_as_none(self):
+        self.assertEqual(collection_utils.filter_dict(self.data, {"team": None}), self.data[1:])
+        self.assertEqual(collection_utils.filter_dict(self.data, {"id": 2, "team": "None"}), [self.data[1]])
+        self.assertEqual(collection_utils.filter_dict(self.data, {"team": "x"}), [self.data[0]])
+
+    def test_strict_missing_key_compares_as_none(self):
+        self.assertEqual(collection_utils.strict_filter_dict(self.data, {"team": None}), self.data[1:])
+        self.assertEqual(collection_utils.strict_filter_dict(self.data, {"id": 2, "team": "None"}), [])
+        self.assertEqual(collection_utils.strict_filter_dict(self.data, {"id": "3"}), [self.data[2]])
+
+
+class FilterIndexedTest(unittest.TestCase):
+    def setUp(self):
+        # Mixed int and str values that stringify alike, and entries lacking indexed keys
+        self.data = [
+            {"id": 1, "user_id": 1, "tag": "a"},
+            {"id": 2, "user_id": "1", "tag": "b"},
+            {"id": 3, "user_id": 2},
+            {"id": "4", "tag": "a"},
+            {"id": 5, "user_id": None, "tag": None},
+            {"id": 6, "user_id": 2, "tag": "a"},
+        ]
+        self.indexes = {key: collection_utils.build_index(self.data, key) for key in ("id", "user_id")}
+
+    def test_matches_filter_dict(self):
+        filter_sets = [
+            {}, {"id": 4}, {"id": "4"}, {"user_id": 1}, {"user_id": "1"}, {"user_id": "None"},
+            {"user_id": 2, "tag": "a"}, {"tag": "a"}, {"tag": "None"}, {"user_id": 1, "id": 2},
+            {"user_id": 3}, {"id": 1, "user_id": 2}, {"missing": "None"}, {"missing": 1},
+        ]
+        for filters in filter_sets:
+            with self.subTest(filters=filters):
+                self.assertEqual(
+                    collection_utils.filter_indexed(self.data, filters, self.indexes),
+                    collection_utils.filter_dict(self.data, filters))
+
+    def test_returns_a_copy_of_the_bucket(self):
+        matches = collection_utils.filter_indexed(self.data, {"user_id": 1}, self.indexes)
+        matches.clear()
+
+        self.assertEqual(len(self.indexes["user_id"]["1"]), 2)
+
+
+class CombineFiltersTest(unittest.TestCase):
+    def test_query_params_take_precedence(self):
+        self.assertEqual(
+            collection_utils.combine_filters({"id": "1", "team": "x"}, {"team": "y", "name": "a"}),
+            {"id": "1", "team": "y", "name": "a"})
+
+    def test_returns_the_other_mapping_when_one_is_empty(self):
+        path_params, query_params = {"id": "1"}, {"name": "a"}
+
+        self.assertIs(collection_utils.combine_filters(path_params, {}), path_params)
+        self.assertIs(collection_utils.combine_filters({}, query_params), query_params)
+
+
+if __name__ == "__main__":
+    unittest.main()
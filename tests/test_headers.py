@@ -0,0 +1,57 @@
+import asyncio
+import importlib.util
+import unittest
+
+from tests.helpers import FakeRequest
+from utils.headers import bearer_header, get_raw_header
+
+HAS_FASTAPI = importlib.util.find_spec("fastapi") is not None
+
+
+class BearerHeaderTest(unittest.TestCase):
+    def test_encodes_as_latin1(self):
+        self.assertEqual(bearer_header("toké"), "Bearer toké".encode("latin-1"))
+        self.assertNotEqual(bearer_header("toké"), "Bearer toké".encode("utf-8"))
+
+    def test_unencodable_token_has_no_header(self):
+        self.assertIsNone(bearer_header("token✓"))
+
+    def test_get_raw_header(self):
+        request = FakeRequest([(b"accept", b"*/*"), (b"authorization", b"Bearer abc")])
+        self.assertEqual(get_raw_header(request, b"authorization"), b"Bearer abc")
+        self.assertIsNone(get_raw_header(request, b"cookie"))
+
+
+@unittest.skipUnless(HAS_FASTAPI, "fastapi is not installed")
+class NonAsciiTokenMiddlewareTest(unittest.TestCase):
+    def run_middleware(self, module, header: bytes, config: dict, metadata: dict):
+        request = FakeRequest([(b"authorization", header)])
+        response, _ = asyncio.run(module.run(request, config, metadata))
+        return response
+
+    def test_auth_token(self):
+        from middleware import auth_token
+        config = {"accepted_token": "toké"}
+        self.assertIsNone(self.run_middleware(auth_token, "Bearer toké".encode("latin-1"), config, {}))
+        response = self.run_middleware(auth_token, "Bearer toké".encode("utf-8"), config, {})
+        self.assertEqual(response.status_code, 401)
+
+    def test_auth_token_unencodable(self):
+        from middleware import auth_token
+        config = {"accepted_token": "token✓"}
+        response = self.run_middleware(auth_token, "Bearer token✓".encode("utf-8"), config, {})
+        self.assertEqual(response.status_code, 401)
+
+    def test_permissions_token(self):
+        from middleware import permissions_token
+        config = {"accepted_tokens": {"admin": "toké", "guest": "token✓"}}
+        metadata = {"accepted_roles": ["admin", "guest"]}
+        config = permissions_token.prepare_config(config, metadata)
+        self.assertIsNone(self.run_middleware(permissions_token, "Bearer toké".encode("latin-1"), config, metadata))
+        for header in ("Bearer toké".encode("utf-8"), "Bearer token✓".encode("utf-8")):
+            response = self.run_middleware(permissions_token, header, config, metadata)
+            self.assertEqual(response.status_code, 401)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import asyncio
+import importlib.util
+import unittest
+
+from tests.helpers import FakeRequest
+
+HAS_FASTAPI = importlib.util.find_spec("fastapi") is not None
+
+
+@unittest.skipUnless(HAS_FASTAPI, "fastapi is not installed")
+class PermissionsTokenIndexTest(unittest.TestCase):
+    def setUp(self):
+        from middleware import permissions_token
+        self.module = permissions_token
+        self.config = {"accepted_tokens": {"admin": "admin-token", "user": "user-token", "owner": "admin-token"}}
+        self.metadata = {"accepted_roles": ["admin"]}
+
+    def status(self, config: dict, token: str):
+        request = FakeRequest([(b"authorization", f"Bearer {token}".encode("latin-1"))])
+        response, _ = asyncio.run(self.module.run(request, config, self.metadata))
+        return None if response is None else response.status_code
+
+    def test_prepare_leaves_user_dicts_untouched(self):
+        config_before = {"accepted_tokens": dict(self.config["accepted_tokens"])}
+        metadata_before = {"accepted_roles": list(self.metadata["accepted_roles"])}
+        self.assertIsNone(self.module.validate_config(self.config))
+        self.assertIsNone(self.module.validate_metadata(self.metadata))
+        prepared = self.module.prepare_config(self.config, self.metadata)
+
+        self.assertEqual(self.config, config_before)
+        self.assertEqual(self.metadata, metadata_before)
+        self.assertEqual(prepared["accepted_roles"], frozenset({"admin"}))
+
+    def test_index_groups_roles_sharing_a_token(self):
+        bearer_roles = self.module.build_bearer_roles(self.config["accepted_tokens"])
+
+        self.assertEqual(bearer_roles, {
+            b"Bearer admin-token": frozenset({"admin", "owner"}),
+            b"Bearer user-token": frozenset({"user"}),
+        })
+
+    def test_run_matches_through_prepared_index(self):
+        prepared = self.module.prepare_config(self.config, self.metadata)
+
+        self.assertIsNone(self.status(prepared, "admin-token"))
+        self.assertEqual(self.status(prepared, "user-token"), 401)
+        self.assertEqual(self.status(prepared, "unknown-token"), 401)
+
+
+if __name__ == "__main__":
+    unittest.main()
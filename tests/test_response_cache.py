@@ -0,0 +1,83 @@
+from unittest import mock
+
+import utils.collection_utils as collection_utils
+from tests.helpers import ServerTestCase
+
+
+ROUTES = [
+    {"method": "GET", "endpoint": "/users/{id}", "data_set": "users", "metadata": {"singular_response": True}},
+    {"method": "GET", "endpoint": "/users", "data_set": "users"},
+    {"method": "POST", "endpoint": "/users", "data_set": "users", "metadata": {"creates_entry": True}},
+    {"method": "PUT", "endpoint": "/users/{id}", "data_set": "users"},
+    {"method": "DELETE", "endpoint": "/users/{id}", "data_set": "users"},
+]
+
+USERS = [{"id": 1, "name": "a", "team": "x"}, {"id": 2, "name": "b", "team": "x"}]
+
+
+class ResponseCacheTest(ServerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client, self.server = self.start_server(ROUTES, {"users": USERS})
+
+    def test_repeated_get_is_served_from_cache(self):
+        self.assertEqual(self.client.get("/users/1").json()["name"], "a")
+        # Changed behind the server's back, so only a cached response still shows the old name
+        self.server.data["users"][0]["name"] = "changed"
+
+        self.assertEqual(self.client.get("/users/1").json()["name"], "a")
+        self.assertEqual(self.client.get("/users", params={"name": "changed"}).json()["data"][0]["id"], 1)
+
+    def test_post_invalidates(self):
+        self.assertEqual(len(self.client.get("/users", params={"team": "x"}).json()["data"]), 2)
+        self.client.post("/users", json={"name": "c", "team": "x"})
+
+        self.assertEqual(len(self.client.get("/users", params={"team": "x"}).json()["data"]), 3)
+
+    def test_put_invalidates(self):
+        self.client.get("/users/1")
+        self.client.put("/users/1", json={"name": "z", "team": "x"})
+
+        self.assertEqual(self.client.get("/users/1").json()["name"], "z")
+
+    def test_delete_invalidates(self):
+        self.client.get("/users/2")
+        self.client.delete("/users/2")
+
+        self.assertEqual(self.client.get("/users/2").status_code, 404)
+
+    def test_reset_invalidates(self):
+        self.client.put("/users/1", json={"name": "z", "team": "x"})
+        self.assertEqual(self.client.get("/users/1").json()["name"], "z")
+
+        self.assertEqual(self.server.reset_datasets(), {})
+        self.assertEqual(self.client.get("/users/1").json()["name"], "a")
+
+    def test_not_cached_when_dataset_changes_mid_build(self):
+        filter_indexed = collection_utils.filter_indexed
+        def filter_then_reset(*args):
+            result = filter_indexed(*args)
+            self.server.invalidate_dataset_cache("users")  # as a reset from the GUI thread would
+            return result
+
+        with mock.patch.object(collection_utils, "filter_indexed", filter_then_reset):
+            self.client.get("/users/1")
+
+        self.assertNotIn("users", self.server.response_cache)
+
+    def test_bodies_bounded_by_size(self):
+        body_size = len(self.client.get("/users/1").content)
+        self.server.invalidate_dataset_cache("users")
+
+        # Room for two entries, or one entry alongside a list holding one entry
+        with mock.patch("server.RESPONSE_CACHE_BYTES", body_size * 2 + len(b'{"data":[]}')):
+            self.client.get("/users/1")
+            self.client.get("/users/2")
+            self.client.get("/users", params={"team": "x"})  # larger than the cap on its own
+
+            self.assertEqual(len(self.server.response_cache["users"]), 2)
+            self.client.get("/users", params={"name": "a"})
+
+        # The least recently used response made way for the new one
+        self.assertEqual(len(self.server.response_cache["users"]), 2)
+        self.assertNotIn(("GET:/users/{id}", (("id", "1"),)), self.server.response_cache["users"])
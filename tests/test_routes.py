@@ -0,0 +1,44 @@
+from tests.helpers import ServerTestCase
+
+
+ROUTES = [
+    {"method": "GET", "endpoint": "/users/{id}", "data_set": "users", "metadata": {"singular_response": True}},
+    {"method": "GET", "endpoint": "/teams/{team}/users", "data_set": "users"},
+    {"method": "PUT", "endpoint": "/users/{id}", "data_set": "users"},
+    {"method": "DELETE", "endpoint": "/teams/{team}/users", "data_set": "users"},
+]
+
+USERS = [
+    {"id": 1, "name": "a", "team": "x"},
+    {"id": 2, "name": "b", "team": "y"},
+    {"id": 3, "name": "c", "team": "x"},
+    {"id": 4, "name": "d", "team": "y"},
+]
+
+
+class IndexedRoutesTest(ServerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client, self.server = self.start_server(ROUTES, {"users": USERS})
+
+    def ids(self, response) -> list:
+        return [entry["id"] for entry in response.json()["data"]]
+
+    def test_put_moves_entry_between_indexed_values(self):
+        self.assertEqual(self.ids(self.client.get("/teams/x/users")), [1, 3])
+        self.client.put("/users/3", json={"name": "c", "team": "y"})
+
+        self.assertEqual(self.ids(self.client.get("/teams/x/users")), [1])
+        # Still in dataset order rather than appended to its new team
+        self.assertEqual(self.ids(self.client.get("/teams/y/users")), [2, 3, 4])
+
+    def test_delete_sweeps_dataset_in_place(self):
+        entries = self.server.data["users"]
+        response = self.client.delete("/teams/x/users")
+
+        self.assertEqual([entry["id"] for entry in response.json()], [1, 3])
+        self.assertIs(self.server.data["users"], entries)
+        self.assertEqual([entry["id"] for entry in entries], [2, 4])
+        self.assertEqual(self.client.get("/users/1").status_code, 404)
+        self.assertEqual(self.ids(self.client.get("/teams/y/users")), [2, 4])
+        self.assertEqual(self.client.get("/teams/x/users").status_code, 404)
@@ -10,10 +10,34 @@ def strict_filter_dict(data: list[dict], filters: dict) -> list[dict]:
     Returns:
         list[dict]: A list of dictionaries from `data` matching all the filters exactly.
     """
-    return [
-        item for item in data
-        if all(item.get(k) == v for k, v in filters.items())
-    ]
+    if not filters:
+        return list(data)
+    keys_values = tuple(filters.items())
+    try:
+        # Well-formed datasets hold every filtered key, so subscript rather than .get() and
+        # unroll the common one to three key cases to avoid a generator per row
+        if len(keys_values) == 1:
+            (k1, v1), = keys_values
+            return [item for item in data if item[k1] == v1]
+        if len(keys_values) == 2:
+            (k1, v1), (k2, v2) = keys_values
+            return [item for item in data if item[k1] == v1 and item[k2] == v2]
+        if len(keys_values) == 3:
+            (k1, v1), (k2, v2), (k3, v3) = keys_values
+            return [
+                item for item in data
+                if item[k1] == v1 and item[k2] == v2 and item[k3] == v3
+            ]
+        return [
+            item for item in data
+            if all(item[k] == v for k, v in keys_values)
+        ]
+    except KeyError:
+        # Some entry lacks a filtered key, treat missing keys as None like before
+        return [
+            item for item in data
+            if all(item.get(k) == v for k, v in keys_values)
+        ]
 
 def filter_dict(data: list[dict], filters: dict) -> list[dict]:
     """
@@ -27,7 +51,128 @@ def filter_dict(data: list[dict], filters: dict) -> list[dict]:
     Returns:
         list[dict]: A list of dictionaries from `data` matching all the filters after string conversion.
     """
-    return [
-        item for item in data
-        if all(str(item.get(k)) == str(v) for k, v in filters.items())
-    ]
\ No newline at end of file
+    if not filters:
+        return list(data)
+    # Stringify the filter values once rather than once per row
+    keys_values = tuple((k, str(v)) for k, v in filters.items())
+    try:
+        if len(keys_values) == 1:
+            (k1, v1), = keys_values
+            return [item for item in data if str(item[k1]) == v1]
+        if len(keys_values) == 2:
+            (k1, v1), (k2, v2) = keys_values
+            return [
+                item for item in data
+                if str(item[k1]) == v1 and str(item[k2]) == v2
+            ]
+        return [
+            item for item in data
+            if all(str(item[k]) == v for k, v in keys_values)
+        ]
+    except KeyError:
+        # Some entry lacks a filtered key, which compares as the string "None"
+        return [
+            item for item in data
+            if all(str(item.get(k)) == v for k, v in keys_values)
+        ]
+
+def build_index(data: list[dict], key: str) -> dict[str, list[dict]]:
+    """
+    Builds a hash index over a list of dictionaries, grouping entries by the string form of the value
+    stored under `key` so it can answer the same lookups as `filter_dict`.
+
+    Args:
+        data (list[dict]): The list of dictionaries to index.
+        key (str): The key whose values the index is built on.
+
+    Returns:
+        dict[str, list[dict]]: Mapping of stringified values to the entries holding them, in `data` order.
+    """
+    index = {}
+    for item in data:
+        index.setdefault(str(item.get(key)), []).append(item)
+    return index
+
+def index_entry(index: dict[str, list[dict]], item: dict, key: str):
+    """
+    Adds an entry to an index built by `build_index`, keeping it in step with its dataset after an append.
+
+    Args:
+        index (dict[str, list[dict]]): The index to update.
+        item (dict): The entry being added to the dataset.
+        key (str): The key the index is built on.
+    """
+    index.setdefault(str(item.get(key)), []).append(item)
+
+def unindex_entries(index: dict[str, list[dict]], items: list[dict], key: str):
+    """
+    Removes entries from an index built by `build_index`, matching by identity rather than equality so
+    only those exact objects are dropped. Each affected bucket is rebuilt once however many of the
+    entries it held.
+
+    Args:
+        index (dict[str, list[dict]]): The index to update.
+        items (list[dict]): The entries being removed from the dataset.
+        key (str): The key the index is built on.
+    """
+    removed = {id(item) for item in items}
+    for value in {str(item.get(key)) for item in items}:
+        bucket = index.get(value)
+        if bucket is None:
+            continue
+        remaining = [entry for entry in bucket if id(entry) not in removed]
+        if remaining:
+            index[value] = remaining
+        else:
+            del index[value]
+
+def filter_indexed(data: list[dict], filters: dict, indexes: dict[str, dict[str, list[dict]]]) -> list[dict]:
+    """
+    Filters a list of dictionaries with the same loose equality as `filter_dict`, using any available
+    index to narrow the candidates before scanning.
+
+    Args:
+        data (list[dict]): The list of dictionaries to filter.
+        filters (dict): Key-value pairs that each returned dictionary must match loosely (string equality).
+        indexes (dict[str, dict[str, list[dict]]]): Indexes over `data` as built by `build_index`, keyed by field.
+
+    Returns:
+        list[dict]: A list of dictionaries from `data` matching all the filters after string conversion.
+    """
+    candidates = None
+    indexed_key = None
+    for key, value in filters.items():
+        index = indexes.get(key)
+        if index is None:
+            continue
+        bucket = index.get(str(value))
+        if not bucket:
+            return []
+        if candidates is None or len(bucket) < len(candidates):
+            candidates = bucket
+            indexed_key = key
+    if candidates is None:
+        return filter_dict(data, filters)
+    remaining = {k: v for k, v in filters.items() if k != indexed_key}
+    if not remaining:
+        return list(candidates)
+    return filter_dict(candidates, remaining)
+
+def combine_filters(path_params: dict, query_params: dict) -> dict:
+    """
+    Combines a request's path and query parameters into one set of filters, with query parameters taking
+    precedence on shared keys. Either mapping is returned as is when the other is empty, which is the
+    common case, so no merged dict is built.
+
+    Args:
+        path_params (dict): The request's path parameters.
+        query_params (dict): The request's query parameters.
+
+    Returns:
+        dict: A mapping holding every filter from both parameter sets.
+    """
+    if not query_params:
+        return path_params
+    if not path_params:
+        return query_params
+    return {**path_params, **query_params}
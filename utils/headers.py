@@ -0,0 +1,38 @@
+from functools import lru_cache
+from typing import Optional
+
+
+@lru_cache(maxsize=64)
+def bearer_header(token: str) -> Optional[bytes]:
+    """
+    Builds the raw Authorization header value that carries a token, cached so each token is only formatted once.
+
+    Args:
+        token (str): The bearer token.
+
+    Returns:
+        bytes or None: The latin-1 encoded "Bearer <token>" header value, or None if the token has characters
+        latin-1 cannot hold, since no request header could then carry it.
+    """
+    # ASGI header bytes are latin-1, which is also how Starlette decodes them
+    try:
+        return f"Bearer {token}".encode("latin-1")
+    except UnicodeEncodeError:
+        return None
+
+
+def get_raw_header(request, name: bytes) -> Optional[bytes]:
+    """
+    Reads a header straight from the ASGI scope rather than building Starlette's decoded Headers view for a single lookup.
+
+    Args:
+        request (Request): The incoming request.
+        name (bytes): The lowercase header name, as ASGI servers provide them.
+
+    Returns:
+        bytes or None: The raw value of the first matching header, or None if it is absent.
+    """
+    for key, value in request.scope["headers"]:
+        if key == name:
+            return value
+    return None
@@ -0,0 +1,71 @@
+from fastapi.responses import Response, StreamingResponse
+import orjson
+
+# Entries serialised per chunk when streaming a list body
+STREAM_CHUNK_SIZE = 500
+
+
+def prerender(content) -> bytes:
+    """
+    Serialises a constant JSON body once, producing the same bytes JSONResponse would render for it.
+
+    Args:
+        content: A JSON-serialisable body, typically an error dict.
+
+    Returns:
+        bytes: The compact JSON encoding of `content`.
+    """
+    return orjson.dumps(content)
+
+
+def prerendered_response(body: bytes, status_code: int) -> Response:
+    """
+    Wraps a body serialised with `prerender` in a JSON response without encoding it again.
+
+    A new Response is built per call rather than shared, as ASGI middleware such as GZip
+    modify the header list of the response object they send.
+
+    Args:
+        body (bytes): The pre-serialised JSON body.
+        status_code (int): The HTTP status code to respond with.
+
+    Returns:
+        Response: A response with the given body and an application/json media type.
+    """
+    return Response(content=body, status_code=status_code, media_type="application/json")
+
+
+def json_response(content, status_code: int) -> Response:
+    """
+    Serialises a JSON body with orjson and wraps it in a response, for bodies built per request.
+
+    Args:
+        content: A JSON-serialisable body.
+        status_code (int): The HTTP status code to respond with.
+
+    Returns:
+        Response: A response with the encoded body and an application/json media type.
+    """
+    return prerendered_response(orjson.dumps(content), status_code)
+
+
+def streamed_list_response(key: str, items: list, status_code: int = 200) -> StreamingResponse:
+    """
+    Streams a {key: [...]} JSON body in chunks of entries rather than serialising it into one buffer,
+    so the first bytes go out before the whole list is encoded. The bytes sent match `prerender`.
+
+    Args:
+        key (str): The top level key holding the list.
+        items (list): The JSON-serialisable entries to send. The list must not be modified while streaming.
+        status_code (int): The HTTP status code to respond with.
+
+    Returns:
+        StreamingResponse: A response streaming the body with an application/json media type.
+    """
+    async def chunks():
+        yield b'{' + orjson.dumps(key) + b':['
+        for start in range(0, len(items), STREAM_CHUNK_SIZE):
+            chunk = b",".join([orjson.dumps(item) for item in items[start:start + STREAM_CHUNK_SIZE]])
+            yield chunk if start == 0 else b"," + chunk
+        yield b"]}"
+    return StreamingResponse(chunks(), status_code=status_code, media_type="application/json")